@@ -0,0 +1,8 @@
+#!/usr/bin/env sh
+set -e
+
+# Benchmarks are not collected by a plain pytest run. Results are saved in
+# .benchmarks, compare e.g. the last two runs with:
+#     pytest-benchmark compare --group-by=name 0001 0002
+pytest benchmarks -o python_files='bench_*.py' -o python_functions='bench_*' \
+    --benchmark-autosave --benchmark-columns=min,mean,stddev,rounds "$@"
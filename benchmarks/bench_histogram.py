@@ -0,0 +1,107 @@
+"""Benchmark class Histogram.
+
+Run with bench.sh, which saves the results for comparison over time. The
+extra info records MB/s or bins/s, and the peak memory of exports.
+"""
+
+from os.path import getsize
+from tracemalloc import get_traced_memory, start, stop
+
+from pytest import fixture, mark
+
+from opentaal import Histogram
+from synthetic import generate
+
+# pylint:disable=missing-function-docstring
+
+SIZES = (1, 4, 16)  # MB
+EXPORTS = {
+    'tsv': lambda hist: hist.to_tsvfile('/tmp/bench.tsv', unicode=False),
+    'md': lambda hist: hist.to_mdfile('/tmp/bench.md', unicode=False),
+    'json': lambda hist: hist.to_jsonfile('/tmp/bench.json', unicode=False),
+    'jsonl': lambda hist: hist.to_jsonfile('/tmp/bench.jsonl', unicode=False,
+                                           lines=True),
+    'save': lambda hist: hist.save('/tmp/bench.hist'),
+}
+
+
+def peak(func, *args) -> float:
+    """Return the peak memory in MB allocated by a function call."""
+    start()
+    try:
+        func(*args)
+        return get_traced_memory()[1] / 1048576
+    finally:
+        stop()
+
+
+def rate(benchmark, name: str, amount: float) -> None:
+    """Record an amount per second of the mean time as extra info.
+
+    Nothing is recorded with --benchmark-disable, which only runs each
+    benchmark once without timing it.
+    """
+    if benchmark.stats is not None:
+        benchmark.extra_info[name] = amount / benchmark.stats.stats.mean
+
+
+def corpus(size: int, chars: bool) -> str:
+    """Return a corpus of sentences, or of one word per line for words."""
+    if chars:
+        return generate(f'/tmp/bench_corpus_{size}.txt', size * 1048576)
+    return generate(f'/tmp/bench_words_{size}.txt', size * 1048576,
+                    wordlist=True)
+
+
+@fixture(scope='module', params=SIZES, ids=lambda size: f'{size}MB')
+def size(request):
+    return request.param
+
+
+@fixture(scope='module')
+def words():
+    return Histogram('Words', filename=corpus(4, False), chars=False)
+
+# pylint:disable=redefined-outer-name
+
+
+@mark.parametrize('chars', (True, False), ids=('chars', 'words'))
+def bench_ingest(benchmark, size, chars):
+    filename = corpus(size, chars)
+    hist = benchmark(Histogram, 'Ingest', filename=filename, chars=chars)
+    rate(benchmark, 'MB/s', getsize(filename) / 1048576)
+    benchmark.extra_info['bins'] = len(hist)
+
+
+def bench_add(benchmark, words):
+    values = [value for value, _ in words.top(100000)]
+
+    def add():
+        hist = Histogram('Add', chars=False)
+        for value in values:
+            hist.add(value)
+    benchmark(add)
+    rate(benchmark, 'values/s', len(values))
+
+
+@mark.parametrize('export', EXPORTS)
+def bench_export(benchmark, words, export):
+    benchmark(EXPORTS[export], words)
+    rate(benchmark, 'bins/s', len(words))
+    benchmark.extra_info['peak MB'] = peak(EXPORTS[export], words)
+
+
+def bench_sqlite(benchmark, words, tmp_path):
+    benchmark(words.to_sqlite, str(tmp_path / 'bench.db'))
+    rate(benchmark, 'bins/s', len(words))
+
+
+@mark.parametrize('top', (100, 1000))
+def bench_graph(benchmark, words, top):
+    benchmark.pedantic(words.to_graphfile, args=('/tmp/bench.png',),
+                       kwargs={'unicode': False, 'top': top}, rounds=3)
+    rate(benchmark, 'bins/s', top)
+
+# pylint:enable=redefined-outer-name
+
+# pylint:enable=missing-function-docstring
@@ -0,0 +1,68 @@
+"""Generator of a synthetic corpus of Dutch-like text for benchmarks."""
+
+from itertools import accumulate
+from os.path import getsize, isfile
+from random import Random
+
+ONSETS = ('', '', '', 'b', 'd', 'g', 'h', 'k', 'l', 'm', 'n', 'p', 'r', 's',
+          't', 'v', 'w', 'z', 'j', 'f', 'st', 'sch', 'gr', 'br', 'kl', 'sl',
+          'sp', 'tr', 'pr', 'bl', 'dr', 'kr', 'fl', 'zw', 'schr')
+NUCLEI = ('a', 'a', 'e', 'e', 'e', 'i', 'o', 'u', 'aa', 'ee', 'oo', 'uu', 'ie',
+          'oe', 'ou', 'ei', 'ij', 'eu', 'ui', 'au', 'é', 'ë', 'ï')
+CODAS = ('', '', 'n', 'n', 'r', 'l', 'k', 't', 's', 'm', 'ng', 'nd', 'rt',
+         'ld', 'cht', 'st', 'p', 'f', 'ns', 'rd')
+
+
+def vocabulary(rand: Random, size: int) -> list[str]:
+    """Return unique words of one to four syllables, most frequent first.
+
+    :param rand: The random number generator.
+    :param size: The number of words.
+    :return: The words.
+    """
+    words: dict[str, None] = {}
+    while len(words) < size:
+        syllables = rand.choices((1, 2, 3, 4), weights=(4, 5, 3, 1))[0]
+        word = ''.join(f'{rand.choice(ONSETS)}{rand.choice(NUCLEI)}'
+                       f'{rand.choice(CODAS)}' for _ in range(syllables))
+        if rand.random() < 0.05:
+            word = word.capitalize()
+        words[word] = None
+    return list(words)
+
+
+def generate(filename: str, size: int, seed: int = 2718,
+             words: int = 50000, wordlist: bool = False) -> str:
+    """Write a reproducible corpus of lines of Dutch-like words.
+
+    Words follow Zipf's law, like in natural language. An existing file of
+    at least the requested size is reused.
+
+    :param filename: The filename to write to.
+    :param size: The minimum size of the corpus in bytes.
+    :param seed: The seed of the random number generator.
+    :param words: The number of unique words.
+    :param wordlist: Write one word per line instead of sentences, for
+        counting words with chars=False, which counts whole lines.
+    :return: The filename.
+    """
+    if isfile(filename) and getsize(filename) >= size:
+        return filename
+    rand = Random(seed)
+    vocab = vocabulary(rand, words)
+    weights = list(accumulate(1 / rank for rank in range(1, words + 1)))
+    written = 0
+    with open(filename, 'w', encoding='utf8') as file:
+        while written < size:
+            if wordlist:
+                lines = rand.choices(vocab, cum_weights=weights, k=1000)
+            else:
+                lines = []
+                for _ in range(1000):
+                    line = ' '.join(rand.choices(vocab, cum_weights=weights,
+                                                 k=rand.randint(1, 15)))
+                    lines.append(line + rand.choice(('', '', '.', ',', '?')))
+            text = '\n'.join(lines) + '\n'
+            file.write(text)
+            written += len(text.encode('utf8'))
+    return filename
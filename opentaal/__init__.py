@@ -3,21 +3,32 @@
 __all__ = [
     'Character',
     'Checker',
+    'Corpus',
     'Database',
+    'Decay',
     'Extractor',
     'Histogram',
+    'HistogramSet',
     'Isocode',
     'Mark',
+    'Progress',
+    'Renderer',
+    'Sketch',
     'Tokenizer',
     'Sorter',
+    'Window',
     'Word',
     'Wordlist',
 ]
 
 from .character import Character
 from .database import Database
+from .decay import Decay
 from .extractor import Extractor
 from .mark import Mark
+from .progress import Progress
+from .renderer import Renderer
+from .sketch import Sketch
 from .sorter import Sorter
 from .tokenizer import Tokenizer
 from .word import Word
@@ -25,4 +36,7 @@ from .wordlist import Wordlist
 
 from .checker import Checker
 from .histogram import Histogram
+from .histogramset import HistogramSet
 from .isocode import Isocode
+from .corpus import Corpus
+from .window import Window
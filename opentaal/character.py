@@ -1,6 +1,7 @@
 """Class definition for Character."""
 
-from unicodedata import name
+from functools import lru_cache
+from unicodedata import category, name
 
 
 class Character():
@@ -17,6 +18,25 @@ class Character():
             return name(char).lower().replace('latin ', 'Latin ')
         return name(char)
 
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def metadata(char: str) -> tuple[str, str, str, str, str, str]:
+        """Get cached Unicode metadata for a character.
+
+        The metadata is looked up once per character, so that e.g. exports of
+        many histograms over the same alphabet do not repeat the lookups.
+
+        :param char: The character for which to get the metadata.
+        :return: A tuple of the Unicode name, category code, abbreviated and
+            full category name, hexidecimal representation and print friendly
+            version.
+        """
+        code = category(char)
+        return (name(char), code,
+                Character.decode_category(code),
+                Character.decode_category(code, abbrev=False),
+                Character.to_hex(char), Character.print_friendly(char))
+
 # pylint:disable=too-many-return-statements
 
     @staticmethod
@@ -0,0 +1,179 @@
+"""Class definition for Corpus."""
+
+from hashlib import sha256
+from json import dump, load
+from os import listdir, makedirs, remove, replace, stat
+from os.path import isfile, join
+
+from opentaal import Histogram, Progress
+
+# pylint:disable=unspecified-encoding
+
+
+class Corpus():
+    """Class for incrementally counting a histogram of a corpus of text files.
+
+    A cache directory keeps a histogram per file, named after the checksum of
+    its content, a manifest with the modification time, size and checksum of
+    each file, and the histogram of the whole corpus. On each update, only new
+    or changed files are counted. The histograms of removed or changed files
+    are subtracted from the histogram of the whole corpus.
+
+    All files are written under a temporary name and then replaced, the
+    manifest last. The manifest also keeps the checksum of the histogram of
+    the whole corpus, so that after a crash between both, the corpus is
+    counted again instead of applying the same changes twice.
+    """
+
+    def __init__(self, desc: str, cache: str, chars: bool = True) -> None:
+        """Construct object and create its cache directory.
+
+        :param desc: The description of the histogram.
+        :param cache: The directory to keep the cache in.
+        :param chars: Process characters or words.
+        :return: Constructed object.
+        """
+        self.__desc: str = desc
+        self.__cache: str = cache
+        self.__chars: bool = chars
+        makedirs(cache, exist_ok=True)
+
+    def __str__(self) -> str:
+        """Return the description.
+
+        :return: The description.
+        """
+        return f'{self.__desc}'
+
+    def __partial(self, checksum: str) -> str:
+        """Return the filename of the cached histogram of a file.
+
+        :param checksum: The checksum of the content of the file.
+        :return: The filename.
+        """
+        mode = 'chars' if self.__chars else 'words'
+        return join(self.__cache, f'{checksum}-{mode}.hist')
+
+    @staticmethod
+    def __digest(filename: str) -> str:
+        """Return the checksum of the bytes of a file.
+
+        :param filename: The filename of the file.
+        :return: The checksum.
+        """
+        digest = sha256()
+        with open(filename, 'rb') as file:
+            while block := file.read(Histogram.BLOCK_SIZE):
+                digest.update(block)
+        return digest.hexdigest()
+
+    @staticmethod
+    def __save(hist: Histogram, filename: str) -> None:
+        """Save a histogram under a temporary name and then replace the file.
+
+        :param hist: The histogram to save.
+        :param filename: The filename to save to.
+        """
+        hist.save(f'{filename}.tmp')
+        replace(f'{filename}.tmp', filename)
+
+    def __manifest(self) -> dict:
+        """Read the manifest, if any, and if it matches the corpus histogram.
+
+        :return: A dictionary of filenames to lists of modification time,
+            size and checksum.
+        """
+        filename = join(self.__cache, 'manifest.json')
+        corpus = join(self.__cache, 'corpus.hist')
+        if not isfile(filename) or not isfile(corpus):
+            return {}
+        with open(filename) as file:
+            manifest = load(file)
+        if manifest['chars'] != self.__chars or \
+           manifest.get('corpus') != self.__digest(corpus):
+            return {}
+        return manifest['files']
+
+    def __count(self, filename: str,
+                progress: Progress = None) -> tuple[Histogram, str]:
+        """Count a text file and compute its checksum in one pass.
+
+        :param filename: The filename of the text file.
+        :param progress: Report the progress of reading the file.
+        :return: A tuple of the histogram of the file and the checksum of its
+            text, see also Word.checksum().
+        """
+        hist = Histogram(filename, chars=self.__chars)
+        digest = sha256()
+        if progress is not None:
+            progress.expect(stat(filename).st_size)
+        for block in Histogram.read_blocks(filename, progress=progress):
+            digest.update(block.encode('utf8'))
+            hist.feed(block)
+            if progress is not None:
+                lines, values, bins = hist.tally(block)
+                progress.update(lines=lines, values=values, bins=bins)
+        hist.flush()
+        return hist, digest.hexdigest()
+
+    def update(self, paths, progress: Progress = None) -> Histogram:
+        """Update the histogram of the corpus with its current text files.
+
+        Files with an unchanged modification time and size are skipped.
+        Other files are read once, in blocks, to both count them and compute
+        the checksum of their text, the same as Word.checksum(), so that the
+        histograms of files which are only renamed, copied or compressed are
+        stored only once.
+
+        :param paths: The filenames or directories of text files, see also
+            Histogram.text_files().
+        :param progress: Report the progress of counting each new or
+            changed file. The bins are those of the file while it is read,
+            and those of the whole corpus after each file and at the end.
+        :return: The histogram of the whole corpus.
+        """
+        old = self.__manifest()
+        if old:
+            res = Histogram.load(join(self.__cache, 'corpus.hist'))
+        else:
+            res = Histogram(self.__desc, chars=self.__chars)
+        files = {}
+        for filename in Histogram.text_files(paths):
+            info = stat(filename)
+            entry = old.get(filename)
+            if entry and entry[:2] == [info.st_mtime_ns, info.st_size]:
+                files[filename] = entry
+                continue
+            hist, checksum = self.__count(filename, progress)
+            files[filename] = [info.st_mtime_ns, info.st_size, checksum]
+            if entry and entry[2] == checksum:
+                continue
+            if entry:
+                res.subtract(Histogram.load(self.__partial(entry[2])))
+            partial = self.__partial(checksum)
+            if not isfile(partial):
+                self.__save(hist, partial)
+            res.merge(hist)
+            if progress is not None:
+                progress.update(bins=len(res))
+        for filename, entry in old.items():
+            if filename not in files:
+                res.subtract(Histogram.load(self.__partial(entry[2])))
+        if progress is not None:
+            progress.update(bins=len(res), force=True)
+        corpus = join(self.__cache, 'corpus.hist')
+        self.__save(res, corpus)
+        manifest = join(self.__cache, 'manifest.json')
+        with open(f'{manifest}.tmp', 'w') as file:
+            dump({'chars': self.__chars, 'corpus': self.__digest(corpus),
+                  'files': files}, file)
+        replace(f'{manifest}.tmp', manifest)
+        used = {self.__partial(entry[2]) for entry in files.values()}
+        for name in listdir(self.__cache):
+            name = join(self.__cache, name)
+            if name.endswith(('-chars.hist', '-words.hist', '.tmp')) and \
+               name not in used:
+                remove(name)
+        return res
+
+# pylint:enable=unspecified-encoding
@@ -2,6 +2,8 @@
 
 from os.path import isabs, isfile, join, realpath
 from os import getcwd
+from sqlite3 import connect as sqlite_connect
+from typing import Callable
 
 
 class Database():  # pylint:disable=too-few-public-methods
@@ -76,3 +78,24 @@ class Database():  # pylint:disable=too-few-public-methods
         return res
 
 # pylint:enable=unspecified-encoding,consider-using-with,too-many-branches
+
+    @staticmethod
+    def connect(filename: str, connector: Callable = None,
+                parent: bool = False):
+        """Connect to a database with credentials from a configuration file.
+
+        :param filename: The filename of the configuration file, see also
+            credentials().
+        :param connector: A DB-API connect function, such as pymysql.connect
+            or mariadb.connect, which is called with the credentials as
+            keyword arguments. By default, an SQLite database file with the
+            name of the database is used, e.g. for local testing.
+        :param parent: Search parent of the current working directory instead.
+        :return: A DB-API connection.
+        """
+        res = Database.credentials(filename, parent=parent)
+        if connector is None:
+            return sqlite_connect(res['database'])
+        if 'port' in res:
+            res['port'] = int(res['port'])
+        return connector(**res)
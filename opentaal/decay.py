@@ -0,0 +1,170 @@
+"""Class definition for Decay."""
+
+from collections import Counter
+from heapq import heapify, heappop, heappush, nlargest
+from itertools import count as counter
+from math import exp, log
+from operator import itemgetter
+from time import monotonic
+from typing import Callable
+
+
+class Decay():
+    """Class for a histogram of a stream in which older values count less.
+
+    Each count halves every halflife seconds. Instead of decaying all counts
+    as time passes, new counts are scaled up by the time passed since a
+    landmark, known as forward decay, so that adding a value does not touch
+    the other counts. When the scale exceeds RENORMALIZE, all counts are
+    scaled down once, and values of which the count has decayed below the
+    threshold are forgotten, which bounds the memory used. The largest count
+    is tracked, and the smallest is kept in a heap of which outdated entries
+    are removed when reading the minimum, so that both are fast.
+
+    See Also
+    --------
+    - https://doi.org/10.1109/ICDE.2009.65 Forward decay
+    """
+
+    RENORMALIZE = 2.0 ** 32
+
+    def __init__(self, desc: str,
+                 halflife: float,
+                 chars: bool = True,
+                 threshold: float = 0.01,
+                 clock: Callable = monotonic) -> None:
+        """Construct object and set its description.
+
+        :param desc: The description of the histogram.
+        :param halflife: The number of seconds in which a count halves.
+        :param chars: Process characters or words, see also Histogram.
+        :param threshold: The decayed count below which values are forgotten.
+        :param clock: A function that returns the current time in seconds.
+        :return: Constructed object.
+        """
+        if halflife <= 0:
+            raise ValueError(f'Unsupported halflife {halflife}.')
+        self.__desc: str = desc
+        self.__chars: bool = chars
+        self.__rate: float = log(2) / halflife
+        self.__threshold: float = threshold
+        self.__clock: Callable = clock
+        self.__landmark: float = clock()
+        self.__data: dict = {}
+        self.__largest = None
+        self.__heap: list[tuple] = []
+        self.__sequence = counter()
+
+    def __len__(self) -> int:
+        """Return the number of unique values."""
+        return len(self.__data)
+
+    def __str__(self) -> str:
+        """Return the description.
+
+        :return: The description.
+        """
+        return f'{self.__desc}'
+
+    def __scale(self) -> float:
+        """Return the current scale of counts, renormalizing if needed.
+
+        :return: The factor by which counts added now are multiplied.
+        """
+        now = self.__clock()
+        exponent = self.__rate * (now - self.__landmark)
+        if exponent <= log(self.RENORMALIZE):
+            return exp(exponent)
+        factor = exp(-exponent)
+        self.__data = {value: weight * factor
+                       for value, weight in self.__data.items()
+                       if weight * factor >= self.__threshold}
+        if self.__largest not in self.__data:
+            self.__largest = None
+        self.__rebuild()
+        self.__landmark = now
+        return 1.0
+
+    def __rebuild(self) -> None:
+        """Build the heap of scaled counts again, without outdated entries."""
+        self.__heap = [(weight, next(self.__sequence), value)
+                       for value, weight in self.__data.items()]
+        heapify(self.__heap)
+
+    def __increment(self, value, weight: float) -> None:
+        """Increase the scaled count of a value.
+
+        The new count is pushed on the heap, which is built again when it
+        holds more than twice as many entries as values.
+
+        :param value: The value to increment.
+        :param weight: The scaled count to add.
+        """
+        weight += self.__data.get(value, 0.0)
+        self.__data[value] = weight
+        if self.__largest is None or weight > self.__data[self.__largest]:
+            self.__largest = value
+        heappush(self.__heap, (weight, next(self.__sequence), value))
+        if len(self.__heap) > 2 * len(self.__data) + 16:
+            self.__rebuild()
+
+    def get(self, value) -> float:
+        """Return the decayed count of a value."""
+        scale = self.__scale()
+        return self.__data.get(value, 0.0) / scale
+
+    def minimum(self) -> float:
+        """Return the minimum decayed count."""
+        scale = self.__scale()
+        heap = self.__heap
+        while heap and self.__data.get(heap[0][2]) != heap[0][0]:
+            heappop(heap)
+        if heap:
+            return heap[0][0] / scale
+        return 0.0
+
+    def maximum(self) -> float:
+        """Return the maximum decayed count."""
+        scale = self.__scale()
+        if self.__largest is None:
+            return 0.0
+        return self.__data[self.__largest] / scale
+
+    def top(self, number: int) -> list[tuple]:
+        """Return the values with the highest decayed counts.
+
+        :param number: The maximum number of values to return.
+        :return: A list of tuples of a value and its count, highest first.
+        """
+        scale = self.__scale()
+        return [(value, weight / scale) for value, weight in
+                nlargest(number, self.__data.items(), key=itemgetter(1))]
+
+    def add(self, value, count: float = 1) -> None:
+        """Add a value by increasing its count, see also Histogram.add().
+
+        :param value: The str, bool, int or float to increment its count.
+        :param count: The number of occurrences to add, above zero.
+        """
+        self.update({value: count})
+
+    def update(self, values) -> None:
+        """Add many values at once, see also Histogram.update().
+
+        :param values: An iterable of values, or a mapping of values to their
+            counts.
+        """
+        counts = Counter(values)
+        if '' in counts or None in counts:
+            raise ValueError('Cannot add empty string or None to'
+                             f' "{self.__desc}".')
+        scale = self.__scale()
+        for value, count in counts.items():
+            if count <= 0:
+                raise ValueError(f'Cannot add count {count} to'
+                                 f' "{self.__desc}".')
+            if self.__chars and isinstance(value, str):
+                for char in value:
+                    self.__increment(char, count * scale)
+            else:
+                self.__increment(value, count * scale)
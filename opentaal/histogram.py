@@ -1,11 +1,35 @@
 """Class definition for Histogram."""
 
+from array import array
+from asyncio import Queue, create_task, sleep
+from bisect import bisect_left, bisect_right, insort
+from bz2 import open as bz2_open
+from codecs import getincrementaldecoder
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from gzip import open as gzip_open
+from heapq import heapreplace, nlargest
+from io import IncrementalNewlineDecoder
+from itertools import chain, groupby, islice
+from json import JSONEncoder, dumps, load as load_json, loads
+from lzma import open as lzma_open
+from math import floor, log
+from mmap import ACCESS_READ, mmap
 from operator import itemgetter
-from unicodedata import category
+from os import cpu_count, walk
+from os.path import getsize, isdir, join, splitext
+from queue import Empty, Queue as BlockQueue
+from re import Pattern, compile  # pylint:disable=redefined-builtin
+from sqlite3 import Connection as SqliteConnection, \
+    connect as sqlite_connect
+from threading import Event, Thread
+from zlib import compress as zlib_compress, decompress as zlib_decompress
 
-from pygnuplot import gnuplot
+from numpy import asarray, bincount, count_nonzero, flatnonzero, \
+    floor_divide, frombuffer, histogram, int64, log as logarithm, unique, \
+    zeros
 
-from opentaal import Character
+from opentaal import Character, Progress, Renderer, Sorter
 
 # pylint:disable=unspecified-encoding
 
@@ -13,41 +37,790 @@ from opentaal import Character
 class Histogram():
     """Class for creating histograms.
 
+    Exports list values with the same count in collation order. Strings are
+    collated with the locale of Sorter once Sorter.initialize() has been
+    called, which changes the locale of the process, and by codepoint
+    otherwise.
+
     See Also
     --------
     - https://en.wikipedia.org/wiki/Histogram
     - https://pypi.org/project/py-gnuplot/
     """
 
+    BLOCK_SIZE: int = 1048576
+    BATCH_SIZE: int = 4096
+    MAGIC: bytes = b'OTHG\x02'
+    QUEUE_SIZE: int = 8
+    MAGICS: dict = {b'\x1f\x8b': 'gzip', b'\xfd7zXZ\x00': 'lzma',
+                    b'\x28\xb5\x2f\xfd': 'zstd'}
+    BZIP2: Pattern = compile(rb'BZh[1-9](1AY&SY|\x17rE8P\x90)')
+    TEXT_EXTENSIONS: tuple = ('.txt', '.txt.gz', '.txt.bz2', '.txt.xz',
+                              '.txt.lzma', '.txt.zst')
+
     def __init__(self, desc: str,
                  filename: str = None,
-                 chars: bool = True) -> None:
+                 chars: bool = True,
+                 backend: str = 'python',
+                 mapped: bool = False,
+                 capacity: int = None,
+                 width: float = None,
+                 base: float = None,
+                 edges: list = None,
+                 ngram: int = 1,
+                 progress: Progress = None) -> None:
         """Construct object and set its description.
 
         :param desc: The description of the histogram.
         :param filename: The filename of text file to process.
         :param chars: Process characters or words. This parameters is
             irrelevant when adding bool, int or float.
+        :param backend: Count characters of files with 'python' or 'numpy'.
+            The latter counts codepoints with NumPy and is only used when
+            chars is True.
+        :param mapped: Read the file memory-mapped in windows of BLOCK_SIZE
+            bytes instead of through a text file. The file must be UTF-8.
+        :param capacity: Keep at most this number of bins with the
+            Space-Saving algorithm, see also error(). By default, all values
+            are counted exactly.
+        :param width: Count int and float values in bins of this width.
+        :param base: Count int and float values in logarithmic bins, from
+            each power of this base to the next.
+        :param edges: Count int and float values in bins between these
+            ascending edges. The last bin includes its upper edge.
+        :param ngram: Count n-grams of this length within each str value or
+            line of text, i.e. sequences of characters, or of words separated
+            by whitespace when chars is False. The NumPy backend is only used
+            for single characters.
+        :param progress: Report the progress of counting the file.
         :return: Constructed object.
+
+        See Also
+        --------
+        - https://doi.org/10.1007/978-3-540-30570-5_27 Space-Saving
         """
-        # TODO Support bin size for int and float
+        if backend not in ('python', 'numpy'):
+            raise ValueError(f'Unsupported backend {backend}.')
+        if capacity is not None and capacity < 1:
+            raise ValueError(f'Unsupported capacity {capacity}.')
+        if (width, base, edges).count(None) < 2:
+            raise ValueError('Use only one of width, base and edges.')
+        if width is not None and width <= 0 or \
+           base is not None and base <= 1 or \
+           edges is not None and (len(edges) < 2 or sorted(edges) != edges):
+            raise ValueError('Unsupported width, base or edges.')
+        if ngram < 1:
+            raise ValueError(f'Unsupported ngram {ngram}.')
         self.__desc: str = desc
         self.__chars: bool = chars
-        self.__data: dict[str, int] = {}
-        self.__min: int = 0
-        self.__max: int = 0
+        self.__backend: str = backend
+        self.__mapped: bool = mapped
+        self.__data: Counter = Counter()
+        self.__capacity: int = capacity
+        self.__errors: dict = {}
+        self.__width: float = width
+        self.__base: float = base
+        self.__edges: tuple = None if edges is None else tuple(edges)
+        self.__ngram: int = ngram
+        self.__pending = None
+        self.__rest: str = ''
+        self.__bins: dict[int, dict] = {}
+        self.__order: list[int] = []
+        self.__indexed: bool = True
+        self.__keys: dict = {}
+        self.__collation = Sorter.key
+        self.__sorted: dict[int, list] = {}
         if filename is not None:
-            # TODO char or word
+            if progress is not None:
+                progress.expect(getsize(filename))
+            self.__ingest(self.read_blocks(filename, mapped, progress),
+                          progress)
+            if progress is not None:
+                progress.update(bins=len(self), force=True)
+
+    @classmethod
+    def from_paths(cls, desc: str, paths, chars: bool = True,
+                   jobs: int = None, backend: str = 'python',
+                   mapped: bool = False, ngram: int = 1,
+                   progress: Progress = None) -> 'Histogram':
+        """Construct a histogram from many text files using multiple processes.
+
+        Directories are searched recursively for .txt files, such as written
+        by Extractor.extract(). The files are divided over the processes by
+        size, so that each process has about the same amount of text to count.
+
+        :param desc: The description of the histogram.
+        :param paths: The filenames or directories of text files to process.
+        :param chars: Process characters or words.
+        :param jobs: The number of processes, by default the number of CPUs.
+        :param backend: Count characters with 'python' or 'numpy'.
+        :param mapped: Read the files memory-mapped.
+        :param ngram: Count n-grams of this length.
+        :param progress: Report the progress of counting the files. With
+            multiple processes, it is updated per process when done.
+        :return: Constructed object.
+        """
+        files = cls.text_files(paths)
+        if jobs is None:
+            jobs = cpu_count() or 1
+        elif jobs < 1:
+            raise ValueError(f'Unsupported jobs {jobs}.')
+        groups = [(0, i, []) for i in range(min(jobs, len(files)))]
+        for size, filename in sorted(((getsize(f), f) for f in files),
+                                     reverse=True):
+            total, i, group = groups[0]
+            group.append(filename)
+            heapreplace(groups, (total + size, i, group))
+        options = {'chars': chars, 'backend': backend, 'mapped': mapped,
+                   'ngram': ngram}
+        res = cls(desc, **options)
+        if progress is not None:
+            progress.expect(sum(total for total, _, _ in groups))
+        if len(groups) < 2:
+            for _, _, group in groups:
+                res.merge(cls._count_files(desc, group, options, progress))
+        else:
+            with ProcessPoolExecutor(max_workers=len(groups)) as executor:
+                for part, (total, _, _) in zip(
+                        executor.map(cls._count_files, [desc] * len(groups),
+                                     [group for _, _, group in groups],
+                                     [options] * len(groups)), groups):
+                    res.merge(part)
+                    if progress is not None:
+                        progress.update(size=total,
+                                        values=sum(part.__data.values()),
+                                        bins=len(res))
+        if progress is not None:
+            progress.update(bins=len(res), force=True)
+        return res
+
+    @classmethod
+    def text_files(cls, paths) -> list[str]:
+        """Return the text files of filenames and directories.
+
+        Directories are searched recursively for .txt files, also when
+        compressed, see also TEXT_EXTENSIONS.
+
+        :param paths: A filename or directory, or an iterable of them.
+        :return: The filenames of the text files.
+        """
+        if isinstance(paths, str):
+            paths = [paths]
+        files = []
+        for path in paths:
+            if isdir(path):
+                for root, _, names in walk(path):
+                    for name in sorted(names):
+                        if name.endswith(cls.TEXT_EXTENSIONS):
+                            files.append(join(root, name))
+            else:
+                files.append(path)
+        return files
+
+    @classmethod
+    def _count_files(cls, desc: str, filenames: list[str], options: dict,
+                     progress: Progress = None) -> 'Histogram':
+        """Count text files into one histogram, used by from_paths().
+
+        :param desc: The description of the histogram.
+        :param filenames: The filenames of text files to process.
+        :param options: The keyword arguments for the constructor.
+        :param progress: Report the progress, only in the same process.
+        :return: The histogram of all files.
+        """
+        res = cls(desc, **options)
+        for filename in filenames:
+            res.__ingest(cls.read_blocks(filename, res.__mapped, progress),
+                         progress)
+        return res
+
+    @classmethod
+    def read_blocks(cls, filename: str, mapped: bool = False,
+                    progress: Progress = None):
+        """Read a text file in blocks of BLOCK_SIZE.
+
+        When memory-mapped, the file is decoded from fixed windows of the
+        mapped buffer. The incremental decoder keeps a UTF-8 sequence split
+        over two windows, and translates line endings like a text file does.
+
+        A compressed file is decompressed while it is read, see also
+        compression(). It must be UTF-8 and is never memory-mapped.
+
+        :param filename: The filename of text file to read.
+        :param mapped: Read the file memory-mapped. The file must be UTF-8.
+        :param progress: Update the number of bytes read, of the compressed
+            file if compressed, after each block.
+        :return: A generator of text blocks.
+        """
+        kind = cls.compression(filename)
+        if kind is not None:
+            yield from cls.__decompress(filename, kind, progress)
+            return
+        if not mapped:
             with open(filename) as file:
-                for line in file:
-                    line = line[:-1]
-                    if chars:
-                        for char in line:
-                            self.add(char)
-                    else:
-                        self.add(line)
-                self.__min = min(self.__data.values())
-                self.__max = max(self.__data.values())
+                position = 0
+                while block := file.read(cls.BLOCK_SIZE):
+                    if progress is not None:
+                        size, position = position, file.buffer.tell()
+                        progress.update(size=position - size)
+                    yield block
+            return
+        if getsize(filename) == 0:
+            return
+        decoder = IncrementalNewlineDecoder(
+            getincrementaldecoder('utf-8')(), translate=True)
+        with open(filename, 'rb') as file, \
+             mmap(file.fileno(), 0, access=ACCESS_READ) as buffer, \
+             memoryview(buffer) as view:
+            for start in range(0, len(view), cls.BLOCK_SIZE):
+                with view[start:start + cls.BLOCK_SIZE] as window:
+                    if progress is not None:
+                        progress.update(size=len(window))
+                    yield decoder.decode(window)
+        yield decoder.decode(b'', final=True)
+
+    @classmethod
+    def compression(cls, filename: str) -> str:
+        """Return the compression of a file, detected by its magic bytes.
+
+        The magic bytes of bzip2 are ASCII, so its header is matched up to
+        the first block or the end of the stream, see BZIP2. The extension is
+        only used for legacy .lzma files, which have no magic bytes.
+
+        :param filename: The filename of the file.
+        :return: The compression 'gzip', 'bz2', 'lzma' or 'zstd', or None.
+        """
+        with open(filename, 'rb') as file:
+            start = file.read(10)
+        for magic, kind in cls.MAGICS.items():
+            if start.startswith(magic):
+                return kind
+        if cls.BZIP2.match(start):
+            return 'bz2'
+        if splitext(filename)[1] == '.lzma':
+            return 'lzma'
+        return None
+
+    @staticmethod
+    def __open(raw, kind: str):
+        """Open a compressed file for reading decompressed bytes.
+
+        :param raw: The compressed file, opened in binary mode.
+        :param kind: The compression, see also compression().
+        :return: A binary file object.
+        """
+        if kind == 'gzip':
+            return gzip_open(raw)
+        if kind == 'bz2':
+            return bz2_open(raw)
+        if kind == 'lzma':
+            return lzma_open(raw)
+        try:
+            # pylint:disable=import-outside-toplevel
+            from zstandard import ZstdDecompressor
+        except ImportError as err:
+            raise ValueError(f'Cannot read "{raw.name}" because zstandard is'
+                             ' not installed.') from err
+        return ZstdDecompressor().stream_reader(raw, closefd=False)
+
+    @classmethod
+    def __decompress(cls, filename: str, kind: str,
+                     progress: Progress = None):
+        """Read a compressed text file in blocks, see also read_blocks().
+
+        A background thread decompresses blocks of BLOCK_SIZE bytes into a
+        queue of at most QUEUE_SIZE blocks, so that decompressing overlaps
+        with decoding and counting.
+
+        :param filename: The filename of the compressed file.
+        :param kind: The compression, see also compression().
+        :param progress: Update the number of compressed bytes read.
+        :return: A generator of text blocks.
+        """
+        blocks = BlockQueue(cls.QUEUE_SIZE)
+        stop = Event()
+
+        def produce() -> None:
+            try:
+                with open(filename, 'rb') as raw, \
+                     cls.__open(raw, kind) as file:
+                    while not stop.is_set():
+                        block = file.read(cls.BLOCK_SIZE)
+                        blocks.put((block, raw.tell()))
+                        if not block:
+                            return
+            except Exception as err:  # pylint:disable=broad-except
+                blocks.put((err, None))
+
+        thread = Thread(target=produce, daemon=True)
+        thread.start()
+        decoder = IncrementalNewlineDecoder(
+            getincrementaldecoder('utf-8')(), translate=True)
+        position = 0
+        try:
+            while True:
+                block, size = blocks.get()
+                if isinstance(block, Exception):
+                    raise block
+                if not block:
+                    break
+                if progress is not None:
+                    size, position = size - position, size
+                    progress.update(size=size)
+                yield decoder.decode(block)
+            yield decoder.decode(b'', final=True)
+        finally:
+            stop.set()
+            try:
+                while True:
+                    blocks.get_nowait()
+            except Empty:
+                pass
+            thread.join()
+
+    def __ingest(self, blocks, progress: Progress = None) -> None:
+        """Count the text read in large blocks, see also feed().
+
+        :param blocks: An iterable of text blocks.
+        :param progress: Update the progress after each block.
+        """
+        for block in blocks:
+            self.feed(block)
+            if progress is not None:
+                self.__progress(progress, block)
+        self.flush()
+
+    def tally(self, block: str) -> tuple[int, int, int]:
+        """Return the lines, values and bins of a block fed to the histogram.
+
+        The values are the lines in words mode, and the characters other than
+        newlines in chars mode. The bins include those still pending. This is
+        used to report progress, see also Progress.update().
+
+        :param block: The block of text just fed, see also feed().
+        :return: A tuple of the number of lines and values in the block, and
+            the current number of bins.
+        """
+        lines = block.count('\n')
+        pending = self.__pending
+        if pending is None:
+            bins = len(self.__data)
+        elif isinstance(pending, Counter):
+            bins = max(len(self.__data), len(pending))
+        else:
+            bins = max(len(self.__data), int(count_nonzero(pending)))
+        return lines, len(block) - lines if self.__chars else lines, bins
+
+    def __progress(self, progress: Progress, block: str) -> None:
+        """Update the progress with a block fed to the histogram.
+
+        :param progress: The progress to update.
+        :param block: The block of text just fed.
+        """
+        lines, values, bins = self.tally(block)
+        progress.update(lines=lines, values=values, bins=bins)
+
+    def feed(self, block: str) -> None:
+        """Count a block of text, such as read from a file.
+
+        Counting is done per block by Counter in C instead of per value. In
+        words mode, a line split over two blocks is carried over to the next.
+        For n-grams, the last n-1 characters are carried over. The counts are
+        added to the histogram by flush(), after the last block. With a
+        capacity, the counts are added after each block instead, so that the
+        memory used does not grow with the number of unique values in all
+        blocks.
+
+        :param block: The text to count.
+        """
+        if self.__pending is None:
+            if self.__chars and self.__backend == 'numpy' and \
+               self.__ngram == 1:
+                self.__pending = zeros(0, dtype=int64)
+            else:
+                self.__pending = Counter()
+        pending = self.__pending
+        if self.__ngram > 1:
+            text = f'{self.__rest}{block}'
+            if self.__chars:
+                size = self.__ngram
+                pending.update(zip(*(text[i:] for i in range(size))))
+                self.__rest = text[-(size - 1):]
+            else:
+                lines = text.split('\n')
+                self.__rest = lines.pop()
+                for line in lines:
+                    pending.update(self.__grams(line))
+        elif not self.__chars:
+            lines = f'{self.__rest}{block}'.split('\n')
+            self.__rest = lines.pop()
+            pending.update(lines)
+        elif self.__backend == 'numpy':
+            codes = bincount(frombuffer(block.encode('utf-32-le'),
+                                        dtype='<u4'))
+            if len(codes) > len(pending):
+                codes[:len(pending)] += pending
+                self.__pending = codes
+            else:
+                pending[:len(codes)] += codes
+        else:
+            pending.update(block)
+        if self.__capacity is not None:
+            pending, self.__pending = self.__pending, None
+            self.__drain(pending)
+
+    def flush(self) -> None:
+        """Add the counts of all blocks passed to feed() to the histogram.
+
+        N-grams are joined into strings only here, once per unique n-gram.
+        With the NumPy backend, the codepoints are converted back to
+        characters only here.
+        """
+        pending, rest = self.__pending, self.__rest
+        self.__pending, self.__rest = None, ''
+        if pending is None:
+            if not rest:
+                return
+            pending = Counter()
+        if not self.__chars:
+            if self.__ngram > 1:
+                pending.update(self.__grams(rest))
+            elif rest:
+                pending[rest] += 1
+        self.__drain(pending)
+
+    def __drain(self, pending) -> None:
+        """Add pending counts of feed() to the histogram, see also flush().
+
+        :param pending: The Counter of values or n-gram tuples, or the NumPy
+            array of counts per codepoint.
+        """
+        if self.__ngram > 1:
+            self.__count({self.__join(gram): count
+                          for gram, count in pending.items()
+                          if not self.__chars or '\n' not in gram})
+            return
+        if not self.__chars:
+            if '' in pending:
+                raise ValueError('Cannot add empty string or None to'
+                                 f' "{self.__desc}".')
+        elif self.__backend == 'numpy':
+            if len(pending) > 10:
+                pending[10] = 0  # newline
+            pending = {chr(code): int(pending[code])
+                       for code in flatnonzero(pending)}
+        else:
+            del pending['\n']
+        self.__count(pending)
+
+    @classmethod
+    async def __adecode(cls, stream, progress: Progress = None):
+        """Decode an async iterator of bytes or str into text chunks.
+
+        Bytes are decoded as UTF-8 incrementally, and line endings are
+        translated like a text file does. Large blocks are split into chunks
+        of at most BLOCK_SIZE characters.
+
+        :param stream: An async iterator of blocks, e.g. asyncio.StreamReader.
+        :param progress: Update the number of bytes, or characters for str
+            blocks, read.
+        :return: An async generator of text chunks.
+        """
+        decoder, empty = None, ''
+        async for block in stream:
+            if progress is not None:
+                progress.update(size=len(block))
+            if decoder is None:
+                empty = block[:0]
+                decoder = IncrementalNewlineDecoder(
+                    None if isinstance(block, str) else
+                    getincrementaldecoder('utf-8')(), translate=True)
+            text = decoder.decode(block)
+            for start in range(0, len(text), cls.BLOCK_SIZE):
+                yield text[start:start + cls.BLOCK_SIZE]
+        if decoder is not None:
+            text = decoder.decode(empty, final=True)
+            if text:
+                yield text
+
+    async def aingest(self, stream, progress: Progress = None) -> None:
+        """Count the text of an async iterator, see also feed().
+
+        The text is counted a chunk at a time, and control is given back to
+        the event loop after each chunk.
+
+        :param stream: An async iterator of bytes or str blocks, e.g.
+            asyncio.StreamReader.
+        :param progress: Report the progress of counting the stream.
+        """
+        async for text in self.__adecode(stream, progress):
+            self.feed(text)
+            if progress is not None:
+                self.__progress(progress, text)
+            await sleep(0)
+        self.flush()
+        if progress is not None:
+            progress.update(bins=len(self), force=True)
+
+    async def aingest_many(self, streams, maxsize: int = 16,
+                           progress: Progress = None) -> None:
+        """Count the text of several async iterators concurrently.
+
+        Each stream is read by its own task into a queue of at most maxsize
+        chunks, so that fast streams wait when counting falls behind. Each
+        stream is counted into its own histogram, which keeps lines and
+        n-grams of different streams apart, and these are merged into this
+        histogram at the end. An error in one stream is raised as soon as that
+        stream ends, and stops reading all other streams.
+
+        :param streams: An iterable of async iterators, see also aingest().
+        :param maxsize: The maximum number of chunks waiting to be counted.
+        :param progress: Report the progress of counting all streams. The
+            bins are those of the stream of the last chunk until the end.
+        """
+        options = {'chars': self.__chars, 'backend': self.__backend,
+                   'capacity': self.__capacity, 'width': self.__width,
+                   'base': self.__base,
+                   'edges': self.__edges and list(self.__edges),
+                   'ngram': self.__ngram}
+        streams = list(streams)
+        parts = [Histogram(self.__desc, **options) for _ in streams]
+        queue = Queue(maxsize)
+
+        async def produce(index: int, stream) -> None:
+            try:
+                async for text in self.__adecode(stream, progress):
+                    await queue.put((index, text))
+            finally:
+                await queue.put((index, None))
+
+        tasks = [create_task(produce(index, stream))
+                 for index, stream in enumerate(streams)]
+        try:
+            remaining = len(tasks)
+            while remaining:
+                index, text = await queue.get()
+                if text is None:
+                    await tasks[index]
+                    remaining -= 1
+                    continue
+                parts[index].feed(text)
+                if progress is not None:
+                    parts[index].__progress(progress, text)
+                await sleep(0)
+        finally:
+            for task in tasks:
+                task.cancel()
+        for part in parts:
+            part.flush()
+            self.merge(part)
+        if progress is not None:
+            progress.update(bins=len(self), force=True)
+
+    def __grams(self, value: str):
+        """Return the n-grams of a value as tuples.
+
+        The n-grams are made by zipping shifted copies of the value, without
+        slicing each n-gram.
+
+        :param value: The str to get the n-grams of.
+        :return: An iterator of tuples of characters, or of words when chars
+            is False.
+        """
+        if not self.__chars:
+            value = value.split()
+        return zip(*(value[i:] for i in range(self.__ngram)))
+
+    def __join(self, gram: tuple) -> str:
+        """Join an n-gram tuple into a str.
+
+        :param gram: The tuple of characters or words.
+        :return: The n-gram, with words separated by a space.
+        """
+        if self.__chars:
+            return ''.join(gram)
+        return ' '.join(gram)
+
+    def __count(self, counts) -> None:
+        """Add the counts of values to the histogram.
+
+        Many counts at once, such as of a file, are added to the Counter in
+        bulk, and the count index is built again only when it is needed, see
+        also __index(). A few counts are added to the index one by one.
+
+        :param counts: A mapping of values to their counts.
+        """
+        if self.__capacity is None and \
+           (not self.__indexed or len(counts) * 8 > len(self.__data)):
+            self.__data.update(counts)
+            self.__bins, self.__order, self.__sorted = {}, [], {}
+            self.__indexed = False
+            return
+        for value, count in counts.items():
+            self.__increment(value, count)
+
+    def __index(self) -> None:
+        """Build the count index again after counts were added in bulk.
+
+        The values are sorted by count once, which is stable so that values
+        with the same count stay in order of arrival, and grouped per count.
+        """
+        if self.__indexed:
+            return
+        data = self.__data
+        self.__bins = {count: dict.fromkeys(values) for count, values in
+                       groupby(sorted(data, key=data.__getitem__),
+                               data.__getitem__)}
+        self.__order = list(self.__bins)
+        self.__indexed = True
+
+    def __increment(self, value, count: int) -> None:
+        """Increase the count of a value and keep the count index up to date.
+
+        With a capacity, a value that is not yet counted while all bins are in
+        use replaces the value with the lowest count. It takes over that count
+        as its error, see also error().
+
+        :param value: The value to increase the count of.
+        :param count: The number to increase the count with.
+        """
+        self.__index()
+        data = self.__data
+        old = data.get(value, 0)
+        new = old + count
+        if not old and self.__capacity is not None and \
+                len(data) >= self.__capacity:
+            low = self.__order[0]
+            smallest = next(iter(self.__bins[low]))
+            self.__move(smallest, low, 0)
+            del data[smallest]
+            self.__errors.pop(smallest, None)
+            self.__errors[value] = low
+            new = low + count
+        data[value] = new
+        self.__move(value, old, new)
+
+    def __move(self, value, old: int, new: int) -> None:
+        """Move a value in the count index from one count to another.
+
+        The index maps each count to the values with that count, in order of
+        arrival, and keeps a sorted list of these counts. This makes queries
+        on counts, such as minimum(), maximum() and top(), fast without
+        sorting all values.
+
+        :param value: The value to move.
+        :param old: The previous count of the value, zero for a new value.
+        :param new: The new count of the value, zero to remove the value.
+        """
+        bins = self.__bins
+        order = self.__order
+        if self.__sorted:
+            self.__sorted.pop(old, None)
+            self.__sorted.pop(new, None)
+        if old:
+            values = bins[old]
+            if new and len(values) == 1 and new not in bins:
+                index = bisect_left(order, old)
+                if (index == 0 or order[index - 1] < new) and \
+                        (index + 1 == len(order) or order[index + 1] > new):
+                    del bins[old]
+                    bins[new] = values
+                    order[index] = new
+                    return
+            del values[value]
+            if not new:
+                self.__keys.pop(value, None)
+            if not values:
+                del bins[old]
+                del order[bisect_left(order, old)]
+        if new:
+            if new not in bins:
+                bins[new] = {}
+                insort(order, new)
+            bins[new][value] = None
+
+    @staticmethod
+    def __key(value) -> tuple:
+        """Return the collation key of a value, see also Sorter.
+
+        Numbers sort before strings, and strings with the same key of the
+        locale sort by codepoint. Before Sorter.initialize(), strings sort
+        only by codepoint.
+
+        :param value: The value.
+        :return: The key.
+        """
+        if isinstance(value, str):
+            return 1, Sorter.key(value) if Sorter.key else value, value
+        return 0, value
+
+    def __collated(self, count: int) -> list:
+        """Return the values with a count in collation order.
+
+        The collation key of each value is computed only once, and the order
+        of each count is kept until a value with that count changes, so that
+        repeated exports do not sort again.
+
+        :param count: The count of the values.
+        :return: The sorted values.
+        """
+        if self.__collation is not Sorter.key:
+            self.__collation = Sorter.key
+            self.__keys, self.__sorted = {}, {}
+        res = self.__sorted.get(count)
+        if res is None:
+            keys = self.__keys
+            for value in self.__bins[count]:
+                if value not in keys:
+                    keys[value] = self.__key(value)
+            res = sorted(self.__bins[count], key=keys.__getitem__)
+            self.__sorted[count] = res
+        return res
+
+    def __items(self, reverse: bool = True, top: int = None,
+                min_count: int = None, collate: bool = False):
+        """Generate the values and their counts from the count index.
+
+        The counts below min_count are skipped by bisection, and only the
+        first top values are taken from the highest counts, so the time taken
+        depends on the number of values generated, not on the number of
+        values in the histogram.
+
+        :param reverse: Start with the highest count instead of the lowest.
+        :param top: Generate only this number of values with the highest
+            counts.
+        :param min_count: Generate only values with at least this count.
+        :param collate: Generate values with the same count in collation
+            order instead of in order of arrival.
+        :return: A generator of tuples of a value and its count.
+        """
+        self.__index()
+        order = self.__order
+        start = 0 if min_count is None else bisect_left(order, min_count)
+        values = self.__collated if collate else self.__bins.__getitem__
+        if reverse or top is not None:
+            items = ((value, order[i])
+                     for i in range(len(order) - 1, start - 1, -1)
+                     for value in values(order[i]))
+            if top is None:
+                yield from items
+            elif reverse:
+                yield from islice(items, top)
+            else:
+                yield from sorted(islice(items, top), key=itemgetter(1))
+            return
+        for i in range(start, len(order)):
+            for value in values(order[i]):
+                yield value, order[i]
+
+    def __low(self) -> int:
+        """Return the highest possible count of a value not in the histogram.
+
+        :return: The minimum count when all bins are in use, otherwise zero.
+        """
+        if self.__capacity is not None and len(self) >= self.__capacity:
+            return self.minimum()
+        return 0
 
     def __len__(self) -> int:
         """Return the number of unique values, also known as bins."""
@@ -68,6 +841,34 @@ class Histogram():
         return f'{self.__desc} chars={self.__chars} len={len(self)}' \
                f' min={self.minimum()} max={self.maximum()}'
 
+    def __add__(self, other: 'Histogram') -> 'Histogram':
+        """Return a new histogram with the combined counts of both.
+
+        :param other: The histogram to combine with.
+        :return: The combined histogram with the description of this one.
+        """
+        if not isinstance(other, Histogram):
+            return NotImplemented
+        res = Histogram(self.__desc, chars=self.__chars,
+                        capacity=self.__capacity, width=self.__width,
+                        base=self.__base,
+                        edges=self.__edges and list(self.__edges),
+                        ngram=self.__ngram)
+        res.merge(self)
+        res.merge(other)
+        return res
+
+    def __iadd__(self, other: 'Histogram') -> 'Histogram':
+        """Merge the counts of another histogram into this one.
+
+        :param other: The histogram to merge.
+        :return: This histogram.
+        """
+        if not isinstance(other, Histogram):
+            return NotImplemented
+        self.merge(other)
+        return self
+
     def get(self, value) -> int:
         """Return the TODO number of unique values, also known as bins.
 
@@ -78,41 +879,284 @@ class Histogram():
             return self.__data[value]
         return 0
 
+    def error(self, value) -> int:
+        """Return the maximum overestimation of the count of a value.
+
+        This is always zero without a capacity. With a capacity, the true
+        count of the value is between get(value) - error(value) and
+        get(value). A value not in the histogram occurred at most minimum()
+        times when all bins are in use.
+
+        :param value: The value to get the error of.
+        :return: The error of the count.
+        """
+        return self.__errors.get(value, 0)
+
     def minimum(self) -> int:
         """Return the minimum count."""
-        if len(self) and self.__min == 0:
-            self.__min = min(self.__data.values())
-        return self.__min
+        self.__index()
+        if self.__order:
+            return self.__order[0]
+        return 0
 
     def maximum(self) -> int:
         """Return the maximum count."""
-        if len(self) and self.__max == 0:
-            self.__max = max(self.__data.values())
-        return self.__max
+        self.__index()
+        if self.__order:
+            return self.__order[-1]
+        return 0
+
+    def top(self, number: int) -> list[tuple]:
+        """Return the values with the highest counts.
+
+        :param number: The maximum number of values to return.
+        :return: A list of tuples of a value and its count, highest first.
+        """
+        return list(islice(self.__items(), number))
+
+    def bottom(self, number: int) -> list[tuple]:
+        """Return the values with the lowest counts.
+
+        :param number: The maximum number of values to return.
+        :return: A list of tuples of a value and its count, lowest first.
+        """
+        return list(islice(self.__items(reverse=False), number))
+
+    def rank(self, value) -> int:
+        """Return the rank of a value, where the highest count has rank one.
 
-    def add(self, value) -> None:
+        Values with the same count have the same rank. The time taken depends
+        on the number of different counts, not on the number of values.
+
+        :param value: The value to get the rank of.
+        :return: The rank, or zero if the value is not in the histogram.
+        """
+        if value not in self.__data:
+            return 0
+        self.__index()
+        start = bisect_left(self.__order, self.__data[value]) + 1
+        return 1 + sum(len(self.__bins[count])
+                       for count in self.__order[start:])
+
+    def percentile(self, percent: float) -> int:
+        """Return the count below or at which a percentage of values fall.
+
+        :param percent: The percentage of values, from 0 to 100.
+        :return: The count, or zero if no values have been added.
+        """
+        if not 0 <= percent <= 100:
+            raise ValueError(f'Unsupported percentage {percent}.')
+        self.__index()
+        needed = percent * len(self) / 100
+        seen = 0
+        for count in self.__order:
+            seen += len(self.__bins[count])
+            if seen >= needed:
+                return count
+        return 0
+
+    def add(self, value, count: int = 1) -> None:
         """Add a value by increasing its count in the histogram.
 
         If Histogram object was constructed character-based (chars=True), when
         a word is added, all characters will be added seperately. Do not mix
         adding different types.
 
-        :param value: The str, bool, int or float to incrment its count by one.
+        :param value: The str, bool, int or float to incrment its count.
+        :param count: The number of occurrences to add, at least one.
         """
         if value in ('', None):
             raise ValueError('Cannot add empty string or None to'
                              f' "{self.__desc}".')
-        if not self.__chars or isinstance(value, (bool, int, float)):
-            if value in self.__data:
-                self.__data[value] += 1
-            else:
-                self.__data[value] = 1
+        if count < 1:
+            raise ValueError(f'Cannot add count {count} to "{self.__desc}".')
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            self.__increment(self.__bin(value), count)
+        elif self.__ngram > 1 and isinstance(value, str):
+            self.update({value: count})
+        elif not self.__chars or isinstance(value, bool):
+            self.__increment(value, count)
         else:
             for char in value:
-                if char in self.__data:
-                    self.__data[char] += 1
+                self.__increment(char, count)
+
+    def update(self, values) -> None:
+        """Add many values at once, see also add().
+
+        The values are first counted by Counter in C, so that each unique value
+        is processed only once.
+
+        :param values: An iterable of values, or a mapping of values to their
+            counts.
+        """
+        counts = Counter(values)
+        if '' in counts or None in counts:
+            raise ValueError('Cannot add empty string or None to'
+                             f' "{self.__desc}".')
+        if self.__ngram > 1:
+            grams = Counter()
+            for value, count in counts.items():
+                if isinstance(value, str):
+                    for gram in self.__grams(value):
+                        grams[self.__join(gram)] += count
                 else:
-                    self.__data[char] = 1
+                    grams[value] += count
+            counts = grams
+        elif self.__chars:
+            chars = Counter()
+            for value, count in counts.items():
+                if isinstance(value, str):
+                    for char in value:
+                        chars[char] += count
+                else:
+                    chars[value] += count
+            counts = chars
+        if self.__width or self.__base or self.__edges:
+            binned = Counter()
+            for value, count in counts.items():
+                if isinstance(value, (int, float)) and \
+                   not isinstance(value, bool):
+                    value = self.__bin(value)
+                binned[value] += count
+            counts = binned
+        self.__count(counts)
+
+    def __bin(self, value: int | float) -> int | float:
+        """Return the bin of a number, which is the lower edge of the bin.
+
+        :param value: The int or float to find the bin for.
+        :return: The value itself when no binning is used.
+        """
+        if self.__width:
+            if isinstance(value, int) and isinstance(self.__width, int):
+                return value // self.__width * self.__width
+            index = floor(round(value / self.__width, 9))
+            return round(index * self.__width, 9)
+        if self.__base:
+            if value <= 0:
+                raise ValueError(f'Cannot add {value} to logarithmic bins of'
+                                 f' "{self.__desc}".')
+            power = floor(log(value, self.__base))
+            if self.__base ** (power + 1) <= value:
+                power += 1
+            elif self.__base ** power > value:
+                power -= 1
+            return self.__base ** power
+        if self.__edges:
+            if not self.__edges[0] <= value <= self.__edges[-1]:
+                raise ValueError(f'Cannot add {value} outside the edges of'
+                                 f' "{self.__desc}".')
+            index = bisect_right(self.__edges, value) - 1
+            return self.__edges[min(index, len(self.__edges) - 2)]
+        return value
+
+    def add_array(self, values) -> None:
+        """Add many numbers at once with NumPy, see also add().
+
+        :param values: A NumPy array, array.array or list of int or float.
+        """
+        values = asarray(values)
+        if values.size == 0:
+            return
+        if self.__edges:
+            if values.min() < self.__edges[0] or \
+               values.max() > self.__edges[-1]:
+                raise ValueError('Cannot add values outside the edges of'
+                                 f' "{self.__desc}".')
+            counts, _ = histogram(values, bins=self.__edges)
+            self.__count({edge: int(count) for edge, count
+                          in zip(self.__edges, counts) if count})
+            return
+        if self.__width:
+            if values.dtype.kind in 'iu' and isinstance(self.__width, int):
+                values = floor_divide(values, self.__width) * self.__width
+            else:
+                indices = floor_divide((values / self.__width).round(9), 1)
+                values = (indices * self.__width).round(9)
+        elif self.__base:
+            if values.min() <= 0:
+                raise ValueError('Cannot add values of zero or less to'
+                                 f' logarithmic bins of "{self.__desc}".')
+            powers = (logarithm(values) / log(self.__base)).round(9)
+            values = self.__base ** floor_divide(powers, 1)
+        keys, counts = unique(values, return_counts=True)
+        self.__count(dict(zip(keys.tolist(), counts.tolist())))
+
+    def merge(self, other: 'Histogram') -> None:
+        """Add all counts of another histogram to this histogram.
+
+        With a capacity, a value missing from one of both histograms is
+        counted as its lowest possible count there, after which only the
+        values with the highest counts are kept. The errors are combined in
+        the same way, so that merged histograms keep their error bounds.
+
+        :param other: The histogram to merge, which must have the same mode.
+        """
+        if self.__chars != other.__chars:
+            raise ValueError(f'Cannot merge "{other.__desc}" into'
+                             f' "{self.__desc}" because chars differs.')
+        if (self.__width, self.__base, self.__edges, self.__ngram) != \
+           (other.__width, other.__base, other.__edges, other.__ngram):
+            raise ValueError(f'Cannot merge "{other.__desc}" into'
+                             f' "{self.__desc}" because binning or ngram'
+                             ' differs.')
+        if self.__capacity is None:
+            self.__count(other.__data)
+            return
+        low, other_low = self.__low(), other.__low()
+        counts = {}
+        errors = {}
+        for value in chain(self.__data, (value for value in other.__data
+                                         if value not in self.__data)):
+            counts[value] = self.__data.get(value, low) + \
+                other.__data.get(value, other_low)
+            errors[value] = self.__errors.get(
+                value, 0 if value in self.__data else low) + \
+                other.__errors.get(
+                    value, 0 if value in other.__data else other_low)
+        self.__data = Counter()
+        self.__bins = {}
+        self.__order = []
+        self.__sorted = {}
+        for value, count in nlargest(self.__capacity, counts.items(),
+                                     key=itemgetter(1)):
+            self.__increment(value, count)
+        self.__errors = {value: errors[value] for value in self.__data
+                         if errors[value]}
+        self.__keys = {value: key for value, key in self.__keys.items()
+                       if value in self.__data}
+
+    def subtract(self, other: 'Histogram') -> None:
+        """Remove all counts of another histogram from this histogram.
+
+        Values of which the count drops to zero are removed. This is the
+        inverse of merge(), e.g. for a file removed from a corpus.
+
+        :param other: The histogram to subtract, which must have the same mode
+            and of which no count may exceed the count in this histogram.
+        """
+        if self.__chars != other.__chars or self.__capacity is not None:
+            raise ValueError(f'Cannot subtract "{other.__desc}" from'
+                             f' "{self.__desc}" because chars differs or'
+                             ' capacity is used.')
+        if (self.__width, self.__base, self.__edges, self.__ngram) != \
+           (other.__width, other.__base, other.__edges, other.__ngram):
+            raise ValueError(f'Cannot subtract "{other.__desc}" from'
+                             f' "{self.__desc}" because binning or ngram'
+                             ' differs.')
+        for value, count in other.__data.items():
+            if count > self.__data.get(value, 0):
+                raise ValueError(f'Cannot subtract "{other.__desc}" from'
+                                 f' "{self.__desc}" because the count of'
+                                 f' {value} would be negative.')
+        self.__index()
+        for value, count in other.__data.items():
+            old = self.__data[value]
+            if old == count:
+                del self.__data[value]
+            else:
+                self.__data[value] = old - count
+            self.__move(value, old, old - count)
 
 # pylint:disable=too-many-arguments
 
@@ -121,7 +1165,9 @@ class Histogram():
                   reverse: bool = True,
                   unicode: bool = True,
                   abbrev: bool = True,
-                  multi: bool = True) -> str:
+                  multi: bool = True,
+                  top: int = None,
+                  min_count: int = None) -> str:
         """Write the description and sorted histogram counts to a string.
 
         :param desc: Include description.
@@ -130,244 +1176,329 @@ class Histogram():
         :param unicode: TODO.
         :param abbrev: TODO.
         :param multi: TODO.
+        :param top: Include only this number of values with the highest
+            counts.
+        :param min_count: Include only values with at least this count.
         :return: The description and histogram.
         """
         return self.to_tsvstring(desc=desc, head=head, reverse=reverse,
                                  unicode=unicode, abbrev=abbrev,
-                                 multi=multi)[0]
+                                 multi=multi, top=top,
+                                 min_count=min_count)[0]
 
-# pylint:disable=too-many-branches
+    def __check(self, pad: bool = False) -> None:
+        """Check that the histogram can be exported.
 
-    def to_tsvstring(self, desc: bool = True,
-                     head: bool = True,
-                     reverse: bool = True,
-                     unicode: bool = True,
-                     abbrev: bool = True,
-                     multi: bool = True) -> tuple[str, int, int]:
-        """Write the description and sorted histogram counts to a TSV string.
-
-        :param desc: Include description.
-        :param head: Include header.
-        :param reverse: Reverse the counts, starting with the highest first.
-        :param unicode: TODO.
-        :param abbrev: TODO.
-        :param multi: TODO.
-        :return: A tuple of string with the description and histogram, int with
-            minimum count and int with maximum count.
-
-        See Also
-        --------
-        - https://en.wikipedia.org/wiki/Tab-separated_values .
+        :param pad: Check also that counts fit the padding of TSV.
         """
         if len(self) == 0:
             raise ValueError(f'Cannot process "{self.__desc}" because no'
                              ' values have been added.')
-        res = ''
+        if pad and self.maximum() >= 10000000:
+            raise ValueError('Unable to pad more than seven spaces at the'
+                             ' moment')
+
+    def __write(self, filename: str, rows) -> None:
+        """Write rows to a file in batches of BATCH_SIZE rows.
+
+        :param filename: The filename to write to.
+        :param rows: An iterable of strings to write.
+        """
+        rows = iter(rows)
+        with open(filename, 'w') as file:
+            while batch := list(islice(rows, self.BATCH_SIZE)):
+                file.write(''.join(batch))
+
+# pylint:disable=too-many-branches
+
+    def __tsvrows(self, desc: bool, head: bool, reverse: bool, unicode: bool,
+                  abbrev: bool, multi: bool, top: int = None,
+                  min_count: int = None):
+        """Generate the lines of to_tsvstring(), see there for parameters."""
         if desc:
-            res = f'{self.__desc}\n'
+            yield f'{self.__desc}\n'
         if head:
             if unicode:
                 if abbrev:
-                    res = f'{res}count\tchar.\tcodep.\tcateg.\tdescription\n'
+                    yield 'count\tchar.\tcodep.\tcateg.\tdescription\n'
                 else:
-                    res = f'{res}count\tcharacter\tcodepoint\tcategory' \
+                    yield 'count\tcharacter\tcodepoint\tcategory' \
                           '\tdescription\n'
             else:
-                res = f'{res}count\tvalue\n'
-        if self.maximum() >= 10000000:
-            raise ValueError('Unable to pad more than seven spaces at the'
-                             ' moment')
+                yield 'count\tvalue\n'
         if unicode:
-            # TODO secondary sort for words!
-            for value, count in sorted(self.__data.items(), key=itemgetter(1),
-                                       reverse=reverse):
-                name = Character.get_name(value)
-                cat = Character.decode_category(code=category(value),
-                                                abbrev=abbrev)
-                esc = Character.print_friendly(value)
-                hxa = Character.to_hex(value)
+            for value, count in self.__items(reverse, top, min_count, True):
+                name, _, short, full, hxa, esc = Character.metadata(value)
+                cat = short if abbrev else full
                 if multi:
-                    res = f'{res}{count: >7}\t{esc}' \
+                    yield f'{count: >7}\t{esc}' \
                           f'\t{hxa}' \
                           f'\t{cat}\t{name}\n'
                 else:
-                    res = f'{res}{count: >7}\t{esc}' \
+                    yield f'{count: >7}\t{esc}' \
                           f' {hxa}' \
                           f' {cat} {name}\n'
                 # perhaps hex(ord(value))
                 # right align
         else:
-            for value, count in sorted(self.__data.items(), key=itemgetter(1),
-                                       reverse=reverse):
-                res = f'{res}{count: >7}\t{Character.print_friendly(value)}\n'
-        return res, self.minimum(), self.maximum()
+            for value, count in self.__items(reverse, top, min_count, True):
+                yield f'{count: >7}\t{Character.print_friendly(value)}\n'
 
-    def to_mdstring(self, desc: bool = True, reverse: bool = True,
-                    unicode: bool = True, multi: bool = True) -> str:
-        """Write the description and sorted histogram counts to a MD string.
+    def to_tsvstring(self, desc: bool = True,
+                     head: bool = True,
+                     reverse: bool = True,
+                     unicode: bool = True,
+                     abbrev: bool = True,
+                     multi: bool = True,
+                     top: int = None,
+                     min_count: int = None) -> tuple[str, int, int]:
+        """Write the description and sorted histogram counts to a TSV string.
 
         :param desc: Include description.
+        :param head: Include header.
         :param reverse: Reverse the counts, starting with the highest first.
         :param unicode: TODO.
+        :param abbrev: TODO.
         :param multi: TODO.
-        :return: The description and histogram.
+        :param top: Include only this number of values with the highest
+            counts.
+        :param min_count: Include only values with at least this count.
+        :return: A tuple of string with the description and histogram, int with
+            minimum count and int with maximum count of all values.
 
         See Also
         --------
-        - https://en.wikipedia.org/wiki/Markdown
+        - https://en.wikipedia.org/wiki/Tab-separated_values .
         """
-        if len(self) == 0:
-            raise ValueError(f'Cannot process "{self.__desc}" because no'
-                             ' values have been added.')
-        res = ''
+        self.__check(pad=True)
+        return ''.join(self.__tsvrows(desc, head, reverse, unicode, abbrev,
+                                      multi, top, min_count)), \
+            self.minimum(), self.maximum()
+
+    def __mdrows(self, desc: bool, reverse: bool, unicode: bool, multi: bool,
+                 top: int = None, min_count: int = None):
+        """Generate the lines of to_mdstring(), see there for parameters."""
         if desc:
-            res = f'{self.__desc}\n\n'
+            yield f'{self.__desc}\n\n'
         if unicode:
             if multi:
-                res = f'{res}count | character | codepoint | categegory |' \
+                yield 'count | character | codepoint | categegory |' \
                       ' description\n'
-                res = f'{res}--: | --- | --: | --- | ---\n'
+                yield '--: | --- | --: | --- | ---\n'
             else:
-                res = f'{res}count | character, codepoint, categegory and' \
+                yield 'count | character, codepoint, categegory and' \
                       ' description\n'
-                res = f'{res}--: | ---\n'
+                yield '--: | ---\n'
         else:
-            res = f'{res}count | value\n'
-            res = f'{res}--: | ---\n'
+            yield 'count | value\n'
+            yield '--: | ---\n'
         if unicode:
-            for value, count in sorted(self.__data.items(), key=itemgetter(1),
-                                       reverse=reverse):
-                name = Character.get_name(value)
-                cat = Character.decode_category(code=category(value),
-                                                abbrev=False)
-                esc = Character.print_friendly(value)
-                hxa = Character.to_hex(value)
+            for value, count in self.__items(reverse, top, min_count, True):
+                name, _, _, cat, hxa, esc = Character.metadata(value)
                 if multi:
-                    res = f'{res}`{count}` | `{esc}`' \
+                    yield f'`{count}` | `{esc}`' \
                           f' | `{hxa}`' \
                           f' | {cat}' \
                           f' | {name}\n'
                 else:
-                    res = f'{res}`{count}` | `{esc}`' \
+                    yield f'`{count}` | `{esc}`' \
                           f' `{hxa}` {cat} {name}\n'
                 # perhaps hex(ord(value))
         else:
-            for value, count in sorted(self.__data.items(), key=itemgetter(1),
-                                       reverse=reverse):
-                res = f'{res}`{count}` | `{Character.print_friendly(value)}`\n'
-        return res
-# pylint:enable=too-many-branches
+            for value, count in self.__items(reverse, top, min_count, True):
+                yield f'`{count}` | `{Character.print_friendly(value)}`\n'
 
-    def to_jsonstring(self, desc: bool = True, reverse: bool = True,
-                      unicode: bool = True, multi: bool = True) -> str:
-        """Write the description and sorted histogram counts to a JSON string.
+    def to_mdstring(self, desc: bool = True, reverse: bool = True,
+                    unicode: bool = True, multi: bool = True,
+                    top: int = None, min_count: int = None) -> str:
+        """Write the description and sorted histogram counts to a MD string.
 
         :param desc: Include description.
         :param reverse: Reverse the counts, starting with the highest first.
         :param unicode: TODO.
         :param multi: TODO.
+        :param top: Include only this number of values with the highest
+            counts.
+        :param min_count: Include only values with at least this count.
         :return: The description and histogram.
 
         See Also
         --------
-        - https://en.wikipedia.org/wiki/JSON
+        - https://en.wikipedia.org/wiki/Markdown
         """
-        if len(self) == 0:
-            raise ValueError(f'Cannot process "{self.__desc}" because no'
-                             ' values have been added.')
-        res = '{\n'
+        self.__check()
+        return ''.join(self.__mdrows(desc, reverse, unicode, multi, top,
+                                     min_count))
+
+    def __jsonrows(self, desc: bool, reverse: bool, unicode: bool,
+                   multi: bool, top: int = None, min_count: int = None):
+        """Generate the lines of to_jsonstring(), see there for parameters."""
+        quote = JSONEncoder(ensure_ascii=False).encode
+        yield '{\n'
         if desc:
-            res = f'{res}  "description": "{self.__desc}",\n'
-        res = f'{res}  "data": [\n'
+            yield f'  "description": {quote(self.__desc)},\n'
+        yield '  "data": [\n'
+        sep = ''
         if unicode:
-            for value, count in sorted(self.__data.items(), key=itemgetter(1),
-                                       reverse=reverse):
-                name = Character.get_name(value)
-                cat = Character.decode_category(code=category(value),
-                                                abbrev=False)
-                esc = Character.print_friendly(value)
-                hxa = Character.to_hex(value)
+            for value, count in self.__items(reverse, top, min_count, True):
+                name, _, _, cat, hxa, esc = Character.metadata(value)
                 if multi:
-                    res = f'{res}    {{\n' \
+                    yield f'{sep}    {{\n' \
                           f'      "count": {count},\n' \
-                          f'      "value": "{esc}",\n' \
+                          f'      "value": {quote(esc)},\n' \
                           f'      "codepoint": "{hxa}",\n' \
                           f'      "category": "{cat}",\n' \
                           f'      "description": "{name}"\n' \
-                          '    },\n'
+                          '    }'
                 else:
-                    res = f'{res}    {{\n' \
+                    yield f'{sep}    {{\n' \
                           f'      "count": {count},\n' \
-                          f'      "value": "{esc}' \
-                          f' {hxa} {cat} {name}"\n' \
-                          '    },\n'
+                          '      "value":' \
+                          f' {quote(f"{esc} {hxa} {cat} {name}")}\n' \
+                          '    }'
+                sep = ',\n'
                 # perhaps hex(ord(value))
         else:
-            for value, count in sorted(self.__data.items(), key=itemgetter(1),
-                                       reverse=reverse):
+            for value, count in self.__items(reverse, top, min_count, True):
                 esc = Character.print_friendly(value)
-                res = f'{res}    {{\n' \
+                yield f'{sep}    {{\n' \
                       f'      "count": {count},\n' \
-                      f'      "value": "{esc}"\n' \
-                      '    },\n'
-        res = f'{res[:-2]}\n'
-        res = f'{res}  ],\n'
-        res = f'{res}  "unique": {len(self)},\n'
-        res = f'{res}  "minimum": {self.minimum()},\n'
-        res = f'{res}  "maximum": {self.maximum()}\n'
-        res = f'{res}}}\n'
-        return res
+                      f'      "value": {quote(esc)}\n' \
+                      '    }'
+                sep = ',\n'
+        yield '\n  ],\n'
+        yield f'  "unique": {len(self)},\n'
+        yield f'  "minimum": {self.minimum()},\n'
+        yield f'  "maximum": {self.maximum()}\n'
+        yield '}\n'
+
+    def __jsonlrows(self, reverse: bool, unicode: bool, multi: bool,
+                    top: int = None, min_count: int = None):
+        """Generate the lines of to_jsonstring() with lines=True."""
+        quote = JSONEncoder(ensure_ascii=False).encode
+        for value, count in self.__items(reverse, top, min_count, True):
+            if not unicode:
+                esc = Character.print_friendly(value)
+                yield f'{{"count": {count}, "value": {quote(esc)}}}\n'
+                continue
+            name, _, _, cat, hxa, esc = Character.metadata(value)
+            if multi:
+                yield f'{{"count": {count}, "value": {quote(esc)},' \
+                      f' "codepoint": "{hxa}", "category": "{cat}",' \
+                      f' "description": "{name}"}}\n'
+            else:
+                yield f'{{"count": {count}, "value":' \
+                      f' {quote(f"{esc} {hxa} {cat} {name}")}}}\n'
+# pylint:enable=too-many-branches
+
+    def to_jsonstring(self, desc: bool = True, reverse: bool = True,
+                      unicode: bool = True, multi: bool = True,
+                      top: int = None, min_count: int = None,
+                      lines: bool = False) -> str:
+        """Write the description and sorted histogram counts to a JSON string.
+
+        The unique, minimum and maximum are of all values, also when only some
+        are included. Strings are escaped by the JSON encoder.
+
+        :param desc: Include description.
+        :param reverse: Reverse the counts, starting with the highest first.
+        :param unicode: TODO.
+        :param multi: TODO.
+        :param top: Include only this number of values with the highest
+            counts.
+        :param min_count: Include only values with at least this count.
+        :param lines: Write JSON Lines, one record per line, without the
+            description and totals.
+        :return: The description and histogram.
+
+        See Also
+        --------
+        - https://en.wikipedia.org/wiki/JSON
+        - https://jsonlines.org/
+        """
+        self.__check()
+        if lines:
+            return ''.join(self.__jsonlrows(reverse, unicode, multi, top,
+                                            min_count))
+        return ''.join(self.__jsonrows(desc, reverse, unicode, multi, top,
+                                       min_count))
 
     def to_tsvfile(self, filename: str, head: bool = True,
                    reverse: bool = True, unicode: bool = True,
-                   multi: bool = True) -> tuple[int, int]:
+                   multi: bool = True, top: int = None,
+                   min_count: int = None) -> tuple[int, int]:
         """Write the description and sorted histogram to an SVG file.
 
+        The rows are streamed to the file, see also to_tsvstring().
+
         :param filename: The filename to write to.
         :param head: TODO
         :param reverse: TODO
         :param unicode: TODO
         :param multi: TODO
+        :param top: Include only this number of values with the highest
+            counts.
+        :param min_count: Include only values with at least this count.
         :return: TODO
         """
-        res = self.to_tsvstring(desc=False, head=head, reverse=reverse,
-                                unicode=unicode, multi=multi)
-        with open(filename, 'w') as file:
-            file.write(res[0])
-        return res[1:]  # TODO Why? explain, need min and max
+        self.__check(pad=True)
+        self.__write(filename, self.__tsvrows(False, head, reverse, unicode,
+                                              True, multi, top, min_count))
+        return self.minimum(), self.maximum()  # TODO Why? need min and max
 
     def to_mdfile(self, filename: str, desc: bool = True, reverse: bool = True,
-                  unicode: bool = True, multi: bool = True) -> None:
+                  unicode: bool = True, multi: bool = True, top: int = None,
+                  min_count: int = None) -> None:
         """Write the description and sorted histogram to a MarkDown file.
 
+        The rows are streamed to the file, see also to_mdstring().
+
         :param filename: The filename to write to.
         :param desc: TODO
         :param reverse: TODO
         :param unicode: TODO
         :param multi: TODO
+        :param top: Include only this number of values with the highest
+            counts.
+        :param min_count: Include only values with at least this count.
         :return: TODO
         """
-        with open(filename, 'w') as file:
-            file.write(self.to_mdstring(desc=desc, reverse=reverse,
-                                        unicode=unicode, multi=multi))
+        self.__check()
+        self.__write(filename, self.__mdrows(desc, reverse, unicode, multi,
+                                             top, min_count))
 
     def to_jsonfile(self, filename: str,
                     desc: bool = True,
                     reverse: bool = True,
                     unicode: bool = True,
-                    multi: bool = True) -> None:
+                    multi: bool = True,
+                    top: int = None,
+                    min_count: int = None,
+                    lines: bool = False) -> None:
         """Write the description and sorted histogram to a JSON file.
 
+        The rows are streamed to the file, see also to_jsonstring().
+
         :param filename: The filename to write to.
+        :param top: Include only this number of values with the highest
+            counts.
+        :param min_count: Include only values with at least this count.
+        :param lines: Write JSON Lines, one record per line.
         """
-        with open(filename, 'w') as file:
-            file.write(self.to_jsonstring(desc=desc, reverse=reverse,
-                                          unicode=unicode, multi=multi))
+        self.__check()
+        if lines:
+            self.__write(filename, self.__jsonlrows(reverse, unicode, multi,
+                                                    top, min_count))
+            return
+        self.__write(filename, self.__jsonrows(desc, reverse, unicode, multi,
+                                               top, min_count))
 
     def to_graphfile(self, filename: str, reverse: bool = True,
                      unicode: bool = True, pattern: bool = True,
                      width: int = 1920, height: int = 1080,
-                     font: str = 'Roboto Slab', term: str = 'png') -> None:
+                     font: str = 'Roboto Slab', term: str = 'png',
+                     renderer: Renderer = None, top: int = None,
+                     min_count: int = None) -> None:
         # TODO transparent background
         # TODO y axis from 0 as option def
         # TODO xlabel angle
@@ -381,30 +1512,351 @@ class Histogram():
         :param filename: The image height.
         :param filename: The font to use.
         :param term: The Gnuplot terminal to use such as 'png' and 'svg'.
+        :param renderer: The renderer to use, e.g. for many graphs with one
+            Gnuplot process. By default, a new one is used for this graph.
+        :param top: Include only this number of values with the highest
+            counts.
+        :param min_count: Include only values with at least this count.
         """
-        # TODO refactor with guplot columns
-        datafilename = f'{filename}.tsv'
-        res = self.to_tsvfile(datafilename, head=False, reverse=reverse,
-                              unicode=unicode, multi=False)
-        plt = gnuplot.Gnuplot(terminal=f'{term} noenhanced size'
-                              f' {width},{height} font "{font}"',
-                              output=f'"{filename}"')
-        style = ['data histogram']
-        if pattern:
-            style.append('fill pattern 5')
+        self.__check(pad=True)
+        if renderer is None:
+            with Renderer() as renderer:
+                self.to_graphfile(filename, reverse=reverse, unicode=unicode,
+                                  pattern=pattern, width=width, height=height,
+                                  font=font, term=term, renderer=renderer,
+                                  top=top, min_count=min_count)
+            return
+        renderer.plot(filename,
+                      self.__tsvrows(False, False, reverse, unicode, True,
+                                     False, top, min_count),
+                      title=self.__desc,
+                      xlabel=f'value ({len(self)} unique)',
+                      ylabel=f'count (min. {self.minimum()}, max.'
+                      f' {self.maximum()})',
+                      pattern=pattern, width=width, height=height, font=font,
+                      term=term)
+
+    @staticmethod
+    def __varints(numbers) -> bytes:
+        """Encode non-negative ints as LEB128 variable length integers.
+
+        :param numbers: An iterable of non-negative ints.
+        :return: The encoded bytes.
+        """
+        res = bytearray()
+        for number in numbers:
+            while number > 127:
+                res.append(number & 127 | 128)
+                number >>= 7
+            res.append(number)
+        return bytes(res)
+
+    @staticmethod
+    def __unvarints(data: bytes, pos: int, amount: int) -> tuple[list, int]:
+        """Decode LEB128 variable length integers.
+
+        :param data: The bytes to decode from.
+        :param pos: The position to start decoding at.
+        :param amount: The number of ints to decode.
+        :return: A tuple of the list of ints and the position after them.
+        """
+        res = []
+        for _ in range(amount):
+            number = shift = 0
+            while True:
+                byte = data[pos]
+                pos += 1
+                number |= (byte & 127) << shift
+                if byte < 128:
+                    break
+                shift += 7
+            res.append(number)
+        return res, pos
+
+    def save(self, filename: str, compress: bool = True) -> None:
+        """Save the histogram to a compact binary file, see also load().
+
+        The file starts with MAGIC and a byte for the mode and compression,
+        followed by the description, the settings of capacity, binning and
+        ngram as JSON, the type of the values, the values as arrays and the
+        counts as variable length integers. With a capacity, the errors of
+        the values follow as variable length integers. Only one type of
+        values is supported: characters, strings, bool, int or float.
+
+        :param filename: The filename to write to.
+        :param compress: Compress the file with zlib.
+        """
+        values = list(self.__data)
+        types = {type(value) for value in values}
+        if len(types) > 1:
+            raise ValueError(f'Cannot save "{self.__desc}" with mixed types.')
+        kind = types.pop().__name__ if types else 'str'
+        if kind == 'str' and all(len(value) == 1 for value in values):
+            kind = 'char'
+        if kind == 'char':
+            keys = array('I', map(ord, values)).tobytes()
+        elif kind == 'str':
+            encoded = [value.encode('utf8') for value in values]
+            keys = self.__varints(map(len, encoded)) + b''.join(encoded)
+        elif kind == 'bool':
+            keys = bytes(values)
+        elif kind == 'int':
+            keys = self.__varints(value * 2 if value >= 0 else -value * 2 - 1
+                                  for value in values)
+        elif kind == 'float':
+            keys = array('d', values).tobytes()
+        else:
+            raise ValueError(f'Cannot save "{self.__desc}" with type {kind}.')
+        desc = self.__desc.encode('utf8')
+        settings = dumps({'capacity': self.__capacity, 'width': self.__width,
+                          'base': self.__base,
+                          'edges': self.__edges and list(self.__edges),
+                          'ngram': self.__ngram}).encode('ascii')
+        body = self.__varints((len(desc),)) + desc + \
+            self.__varints((len(settings),)) + settings + \
+            self.__varints((len(kind),)) + kind.encode('ascii') + \
+            self.__varints((len(values),)) + keys + \
+            self.__varints(self.__data.values())
+        if self.__capacity is not None:
+            body += self.__varints(self.__errors.get(value, 0)
+                                   for value in values)
+        if compress:
+            body = zlib_compress(body)
+        with open(filename, 'wb') as file:
+            file.write(self.MAGIC)
+            file.write(bytes((self.__chars | compress << 1,)))
+            file.write(body)
+
+    @classmethod
+    def load(cls, filename: str) -> 'Histogram':
+        """Load a histogram from a binary file written by save().
+
+        Files of the previous version of the format, without settings, are
+        also supported.
+
+        :param filename: The filename to read from.
+        :return: The loaded histogram.
+        """
+        with open(filename, 'rb') as file:
+            data = file.read()
+        legacy = data.startswith(cls.MAGIC[:-1] + b'\x01')
+        if not legacy and not data.startswith(cls.MAGIC):
+            raise ValueError(f'Unsupported file format of {filename}.')
+        flags = data[len(cls.MAGIC)]
+        data = data[len(cls.MAGIC) + 1:]
+        if flags & 2:
+            data = zlib_decompress(data)
+        (size,), pos = cls.__unvarints(data, 0, 1)
+        desc = data[pos:pos + size].decode('utf8')
+        settings = {}
+        if not legacy:
+            (size,), pos = cls.__unvarints(data, pos + size, 1)
+            settings = loads(data[pos:pos + size])
+        (size,), pos = cls.__unvarints(data, pos + size, 1)
+        kind = data[pos:pos + size].decode('ascii')
+        (amount,), pos = cls.__unvarints(data, pos + size, 1)
+        if kind == 'char':
+            values = [chr(code) for code in
+                      array('I', data[pos:pos + 4 * amount])]
+            pos += 4 * amount
+        elif kind == 'str':
+            sizes, pos = cls.__unvarints(data, pos, amount)
+            values = []
+            for size in sizes:
+                values.append(data[pos:pos + size].decode('utf8'))
+                pos += size
+        elif kind == 'bool':
+            values = [bool(byte) for byte in data[pos:pos + amount]]
+            pos += amount
+        elif kind == 'int':
+            values, pos = cls.__unvarints(data, pos, amount)
+            values = [value >> 1 if value % 2 == 0 else -(value + 1 >> 1)
+                      for value in values]
+        else:
+            values = array('d', data[pos:pos + 8 * amount]).tolist()
+            pos += 8 * amount
+        counts, pos = cls.__unvarints(data, pos, amount)
+        res = cls(desc, chars=bool(flags & 1), **settings)
+        res.__count(dict(zip(values, counts)))
+        if res.__capacity is not None:
+            errors, _ = cls.__unvarints(data, pos, amount)
+            res.__errors = {value: error for value, error
+                            in zip(values, errors) if error}
+        return res
+
+    @staticmethod
+    def __parse(text: str, chars: bool) -> str:
+        """Parse a value of a TSV or JSON export back to the value.
+
+        :param text: The exported value, possibly with codepoint, category
+            and description.
+        :param chars: Restore print friendly characters.
+        :return: The value.
+        """
+        parts = text.split(' ')
+        if len(parts) > 3 and parts[1].startswith('U+'):
+            try:
+                char = bytes.fromhex(parts[1][2:]).decode('utf8')
+            except ValueError:
+                char = ''
+            if len(char) == 1 and Character.print_friendly(char) == parts[0]:
+                return char
+        if chars:
+            unfriendly = {'↹': '\t', '⏎': '\n', '␣': ' ', '⍽': '\u00a0'}
+            return unfriendly.get(text, text)
+        return text
+
+    @classmethod
+    def from_tsv(cls, filename: str, desc: str = None,
+                 chars: bool = True) -> 'Histogram':
+        """Construct a histogram from a file written by to_tsvfile().
+
+        Values are read as str. The values of Unicode exports are restored
+        from their codepoints.
+
+        :param filename: The filename to read from.
+        :param desc: The description, by default the filename.
+        :param chars: Whether the histogram is of characters or words.
+        :return: Constructed object.
+        """
+        counts = Counter()
+        with open(filename) as file:
+            for line in file:
+                fields = line.rstrip('\n').split('\t')
+                if fields[0] == 'count':
+                    continue
+                if len(fields) > 2:
+                    value = bytes.fromhex(fields[2][2:]).decode('utf8')
+                else:
+                    value = cls.__parse(fields[1], chars)
+                counts[value] += int(fields[0])
+        res = cls(desc or filename, chars=chars)
+        res.__count(counts)
+        return res
+
+    @classmethod
+    def from_json(cls, filename: str, desc: str = None,
+                  chars: bool = True, lines: bool = False) -> 'Histogram':
+        """Construct a histogram from a file written by to_jsonfile().
+
+        Values are read as str. The values of Unicode exports are restored
+        from their codepoints.
+
+        :param filename: The filename to read from.
+        :param desc: The description, by default the one in the file, or the
+            filename for JSON Lines.
+        :param chars: Whether the histogram is of characters or words.
+        :param lines: Read JSON Lines, one record per line.
+        :return: Constructed object.
+        """
+        with open(filename) as file:
+            if lines:
+                data = {'description': filename,
+                        'data': [loads(line) for line in file if line.strip()]}
+            else:
+                data = load_json(file)
+        counts = Counter()
+        for row in data['data']:
+            if 'codepoint' in row:
+                value = bytes.fromhex(row['codepoint'][2:]).decode('utf8')
+            else:
+                value = cls.__parse(row['value'], chars)
+            counts[value] += row['count']
+        res = cls(desc or data.get('description', ''), chars=chars)
+        res.__count(counts)
+        return res
+
+    def __sqlrows(self, unicode: bool):
+        """Generate the rows of to_sqlite(), see there for parameters."""
+        for value, count in self.__items(collate=True):
+            codepoint = category = name = None
+            if unicode and isinstance(value, str) and len(value) == 1:
+                try:
+                    name, _, _, category, codepoint, _ = \
+                        Character.metadata(value)
+                except ValueError:
+                    pass
+            yield str(value), count, codepoint, category, name
+
+    def to_sqlite(self, target, table: str = 'histogram',
+                  unicode: bool = True) -> None:
+        """Write the histogram to a database table, adding to its counts.
+
+        The table is created if needed, with the value as primary key. The
+        rows are inserted in batches of BATCH_SIZE with executemany() in a
+        single transaction. Values already in the table have their counts
+        increased, so that several runs can be accumulated. For a connection
+        other than SQLite, the MySQL and MariaDB dialect is used, see also
+        Database.connect().
+
+        :param target: The filename of an SQLite database, or a DB-API
+            connection.
+        :param table: The name of the table.
+        :param unicode: Include the codepoint, category and description of
+            characters.
+        """
+        if not table.isidentifier():
+            raise ValueError(f'Unsupported table {table}.')
+        self.__check()
+        conn = sqlite_connect(target) if isinstance(target, str) else target
+        if isinstance(conn, SqliteConnection):
+            key, mark = 'TEXT', '?'
+            upsert = 'ON CONFLICT(value) DO UPDATE SET count = count +' \
+                ' excluded.count'
         else:
-            style.append('fill solid noborder')
-        plt.set(title=f'"{self.__desc}"',
-                ylabel=f'"count (min. {res[0]}, max. {res[1]})"',
-                y2label='"\\n\\n\\n\\n\\n\\n"',
-                xlabel=f'"value ({len(self)} unique)"',
-                xtics='rotate by -90 scale 0 nomirror',
-                grid='y',
-                style=style,
-                boxwidth='3',
-                datafile='separator "\t"',
-                key=None)
-        plt.plot(f'"{datafilename}" using 1:xtic(2) linecolor 8')
+            key, mark = 'VARCHAR(255) COLLATE utf8mb4_bin', '%s'
+            upsert = 'ON DUPLICATE KEY UPDATE count = count + VALUES(count)'
+        cursor = conn.cursor()
+        try:
+            cursor.execute(f'CREATE TABLE IF NOT EXISTS {table} (value {key}'
+                           ' PRIMARY KEY, count BIGINT NOT NULL, codepoint'
+                           ' VARCHAR(16), category VARCHAR(32), description'
+                           ' VARCHAR(255))')
+            rows = self.__sqlrows(unicode)
+            while batch := list(islice(rows, self.BATCH_SIZE)):
+                cursor.executemany(f'INSERT INTO {table} (value, count,'
+                                   ' codepoint, category, description)'
+                                   f' VALUES ({", ".join([mark] * 5)})'
+                                   f' {upsert}', batch)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            cursor.close()
+            if isinstance(target, str):
+                conn.close()
+
+    @classmethod
+    def from_sqlite(cls, source, table: str = 'histogram', desc: str = None,
+                    chars: bool = True) -> 'Histogram':
+        """Construct a histogram from a table written by to_sqlite().
+
+        Values are read as str.
+
+        :param source: The filename of an SQLite database, or a DB-API
+            connection.
+        :param table: The name of the table.
+        :param desc: The description, by default the name of the table.
+        :param chars: Whether the histogram is of characters or words.
+        :return: Constructed object.
+        """
+        if not table.isidentifier():
+            raise ValueError(f'Unsupported table {table}.')
+        conn = sqlite_connect(source) if isinstance(source, str) else source
+        cursor = conn.cursor()
+        counts = Counter()
+        try:
+            cursor.execute(f'SELECT value, count FROM {table}')
+            while batch := cursor.fetchmany(cls.BATCH_SIZE):
+                counts.update(dict(batch))
+        finally:
+            cursor.close()
+            if isinstance(source, str):
+                conn.close()
+        res = cls(desc or table, chars=chars)
+        res.__count(counts)
+        return res
 
 # pylint:enable=too-many-arguments
 
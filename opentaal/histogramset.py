@@ -0,0 +1,116 @@
+"""Class definition for HistogramSet."""
+
+from os.path import getsize
+from typing import Callable
+
+from opentaal import Histogram, Progress
+
+
+class HistogramSet():
+    """Class for counting several histograms of the same text in one pass.
+
+    Each block of text is read and decoded once, and then fed to all
+    histograms, e.g. of characters, words and n-grams. Histograms of values
+    derived from each line, such as its length, are fed the derived values.
+    """
+
+    def __init__(self) -> None:
+        """Construct object without histograms.
+
+        :return: Constructed object.
+        """
+        self.__histograms: list[Histogram] = []
+        self.__derived: list[tuple[Histogram, Callable]] = []
+        self.__rest: str = ''
+
+    def __len__(self) -> int:
+        """Return the number of histograms."""
+        return len(self.__histograms) + len(self.__derived)
+
+    def __iter__(self):
+        """Iterate over the histograms in the order they were added."""
+        return iter([*self.__histograms,
+                     *(histogram for histogram, _ in self.__derived)])
+
+    def add(self, histogram: Histogram,
+            derive: Callable = None) -> Histogram:
+        """Add a histogram to count the text with.
+
+        :param histogram: The histogram to add.
+        :param derive: A function that derives the value to count from each
+            line, e.g. len for a histogram of line lengths.
+        :return: The added histogram.
+        """
+        if derive is None:
+            self.__histograms.append(histogram)
+        else:
+            self.__derived.append((histogram, derive))
+        return histogram
+
+    def feed(self, block: str) -> None:
+        """Count a block of text with all histograms.
+
+        The block is split into lines only once for all derived values. The
+        counts are added to the histograms by flush(), see also
+        Histogram.feed().
+
+        :param block: The text to count.
+        """
+        for histogram in self.__histograms:
+            histogram.feed(block)
+        if self.__derived:
+            lines = f'{self.__rest}{block}'.split('\n')
+            self.__rest = lines.pop()
+            for histogram, derive in self.__derived:
+                histogram.update(map(derive, lines))
+
+    def flush(self) -> None:
+        """Add the counts of all blocks passed to feed() to the histograms."""
+        for histogram in self.__histograms:
+            histogram.flush()
+        if self.__rest:
+            for histogram, derive in self.__derived:
+                histogram.add(derive(self.__rest))
+            self.__rest = ''
+
+    def tally(self, block: str) -> tuple[int, int, int]:
+        """Return the lines, values and bins of a block fed to all histograms.
+
+        The values and bins are summed over all histograms, see also
+        Histogram.tally(). A derived histogram counts one value per line.
+
+        :param block: The block of text just fed, see also feed().
+        :return: A tuple of the number of lines and values in the block, and
+            the current number of bins.
+        """
+        lines = block.count('\n')
+        values = bins = 0
+        for histogram in self.__histograms:
+            _, count, size = histogram.tally(block)
+            values += count
+            bins += size
+        for histogram, _ in self.__derived:
+            values += lines
+            bins += len(histogram)
+        return lines, values, bins
+
+    def ingest(self, filename: str, mapped: bool = False,
+               progress: Progress = None) -> None:
+        """Count a text file with all histograms, reading it only once.
+
+        :param filename: The filename of text file to process.
+        :param mapped: Read the file memory-mapped, see also
+            Histogram.read_blocks().
+        :param progress: Report the progress of reading the file, with the
+            values and bins of all histograms, see also tally().
+        """
+        if progress is not None:
+            progress.expect(getsize(filename))
+        for block in Histogram.read_blocks(filename, mapped, progress):
+            self.feed(block)
+            if progress is not None:
+                lines, values, bins = self.tally(block)
+                progress.update(lines=lines, values=values, bins=bins)
+        self.flush()
+        if progress is not None:
+            progress.update(bins=sum(map(len, self)), force=True)
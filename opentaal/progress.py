@@ -0,0 +1,124 @@
+"""Class definition for Progress."""
+
+import sys
+from time import monotonic
+from typing import Callable
+
+
+class Progress():
+    """Class for reporting the progress of counting large amounts of text.
+
+    The counters are updated once per block of text by the ingestion methods
+    of Histogram and HistogramSet, and reported at most once per interval.
+    """
+
+    def __init__(self, callback: Callable = None,
+                 interval: float = 1.0,
+                 clock: Callable = monotonic) -> None:
+        """Construct object and start its clock.
+
+        :param callback: A function called with this object to report it. By
+            default, the report is printed to stderr.
+        :param interval: The minimum number of seconds between reports.
+        :param clock: A function that returns the current time in seconds.
+        :return: Constructed object.
+        """
+        self.__callback: Callable = callback
+        self.__interval: float = interval
+        self.__clock: Callable = clock
+        self.__started: float = clock()
+        self.__reported: float = self.__started
+        self.__size: int = 0
+        self.__total: int = 0
+        self.__lines: int = 0
+        self.__values: int = 0
+        self.__bins: int = 0
+
+    def __str__(self) -> str:
+        """Return a one-line report.
+
+        :return: The report.
+        """
+        res = f'{self.__size / 1048576:.1f}'
+        if self.__total:
+            res += f' of {self.__total / 1048576:.1f}'
+        res += f' MB, {self.__lines} lines, {self.__values} values,' \
+               f' {self.__bins} bins, {self.elapsed():.1f} s,' \
+               f' {self.throughput() / 1048576:.1f} MB/s'
+        remaining = self.remaining()
+        if remaining is not None:
+            res += f', {remaining:.1f} s remaining'
+        return res
+
+    def size(self) -> int:
+        """Return the number of bytes read."""
+        return self.__size
+
+    def total(self) -> int:
+        """Return the number of bytes expected to be read."""
+        return self.__total
+
+    def lines(self) -> int:
+        """Return the number of lines read."""
+        return self.__lines
+
+    def values(self) -> int:
+        """Return the number of values counted."""
+        return self.__values
+
+    def bins(self) -> int:
+        """Return the number of bins, i.e. unique values, so far."""
+        return self.__bins
+
+    def elapsed(self) -> float:
+        """Return the number of seconds since construction."""
+        return self.__clock() - self.__started
+
+    def throughput(self) -> float:
+        """Return the number of bytes read per second."""
+        elapsed = self.elapsed()
+        return self.__size / elapsed if elapsed > 0 else 0.0
+
+    def remaining(self) -> float:
+        """Return the estimated number of seconds remaining.
+
+        :return: The number of seconds, or None when unknown.
+        """
+        throughput = self.throughput()
+        if not self.__total or not throughput:
+            return None
+        return max(self.__total - self.__size, 0) / throughput
+
+    def expect(self, size: int) -> None:
+        """Increase the number of bytes expected to be read, e.g. per file.
+
+        :param size: The number of bytes.
+        """
+        self.__total += size
+
+    def update(self, size: int = 0, lines: int = 0, values: int = 0,
+               bins: int = None, force: bool = False) -> None:
+        """Increase the counters, and report if the interval has passed.
+
+        :param size: The number of bytes read since the last update.
+        :param lines: The number of lines read since the last update.
+        :param values: The number of values counted since the last update.
+        :param bins: The current number of bins, if known.
+        :param force: Report also if the interval has not passed, e.g. when
+            done.
+        """
+        self.__size += size
+        self.__lines += lines
+        self.__values += values
+        if bins is not None:
+            self.__bins = bins
+        if force or self.__clock() - self.__reported >= self.__interval:
+            self.__report()
+
+    def __report(self) -> None:
+        """Report the progress now."""
+        self.__reported = self.__clock()
+        if self.__callback is None:
+            print(self, file=sys.stderr)
+        else:
+            self.__callback(self)
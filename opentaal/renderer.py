@@ -0,0 +1,93 @@
+"""Class definition for Renderer."""
+
+from itertools import islice
+
+from pygnuplot import gnuplot
+
+
+class Renderer():
+    """Class for rendering graphs with one running Gnuplot process.
+
+    The process is started once and kept running for all graphs until close()
+    is called, also when used as a context manager. The data of each graph is
+    sent inline as a datablock instead of through a temporary file.
+    """
+
+    BATCH_SIZE = 4096
+
+    def __init__(self) -> None:
+        """Construct object and start Gnuplot.
+
+        :return: Constructed object.
+        """
+        self.__plt = gnuplot.Gnuplot(log=False)
+
+    def __enter__(self) -> 'Renderer':
+        """Return this renderer for use as a context manager."""
+        return self
+
+    def __exit__(self, *args) -> None:
+        """Close this renderer at the end of a with statement."""
+        self.close()
+
+    def close(self) -> None:
+        """Wait for Gnuplot to finish all graphs and stop it."""
+        self.__plt.close()
+
+    def render(self, graphs, **options) -> None:
+        """Render the graphs of several histograms.
+
+        :param graphs: An iterable of tuples of a histogram and the filename
+            to write its graph to.
+        :param options: The keyword arguments for Histogram.to_graphfile().
+        """
+        for histogram, filename in graphs:
+            histogram.to_graphfile(filename, renderer=self, **options)
+
+# pylint:disable=too-many-arguments
+
+    def plot(self, filename: str, rows, title: str, xlabel: str,
+             ylabel: str, pattern: bool = True, width: int = 1920,
+             height: int = 1080, font: str = 'Roboto Slab',
+             term: str = 'png') -> None:
+        """Render rows of a count and a value as a histogram graph.
+
+        :param filename: The filename to write to.
+        :param rows: An iterable of lines of a count, a tab and a value.
+        :param title: The title of the graph.
+        :param xlabel: The label of the x axis.
+        :param ylabel: The label of the y axis.
+        :param pattern: Fill the bars with a pattern instead of a solid color.
+        :param width: The image width.
+        :param height: The image height.
+        :param font: The font to use.
+        :param term: The Gnuplot terminal to use such as 'png' and 'svg'.
+        """
+        plt = self.__plt
+        style = ['data histogram']
+        if pattern:
+            style.append('fill pattern 5')
+        else:
+            style.append('fill solid noborder')
+        plt.set(terminal=f'{term} noenhanced size {width},{height} font'
+                f' "{font}"',
+                output=f'"{filename}"',
+                title=f'"{title}"',
+                ylabel=f'"{ylabel}"',
+                y2label='"\\n\\n\\n\\n\\n\\n"',
+                xlabel=f'"{xlabel}"',
+                xtics='rotate by -90 scale 0 nomirror',
+                grid='y',
+                style=style,
+                boxwidth='3',
+                datafile='separator "\t"',
+                key=None)
+        plt('$DATA << EOD')
+        rows = iter(rows)
+        while batch := list(islice(rows, self.BATCH_SIZE)):
+            plt.write(''.join(batch).encode('utf8'))
+        plt('EOD')
+        plt.plot('$DATA using 1:xtic(2) linecolor 8')
+        plt.set(output='')
+
+# pylint:enable=too-many-arguments
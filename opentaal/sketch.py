@@ -0,0 +1,189 @@
+"""Class definition for Sketch."""
+
+from collections import Counter
+from hashlib import blake2b
+from math import ceil, e, log
+
+from numpy import add, array, generic, int64, maximum, zeros
+
+
+class Sketch():
+    """Class for approximately counting values in a fixed amount of memory.
+
+    A Count-Min sketch never underestimates a count. With probability
+    1 - delta, it overestimates a count by at most epsilon times the total
+    count. Values are hashed with BLAKE2, so that sketches made in different
+    processes can be merged.
+
+    See Also
+    --------
+    - https://en.wikipedia.org/wiki/Count%E2%80%93min_sketch
+    - https://doi.org/10.1016/j.jalgor.2003.12.001
+    """
+
+    def __init__(self, desc: str,
+                 epsilon: float = 0.001,
+                 delta: float = 0.01,
+                 conservative: bool = True) -> None:
+        """Construct object and set its description.
+
+        :param desc: The description of the sketch.
+        :param epsilon: The relative error of counts, which sets the width.
+        :param delta: The probability of a larger error, which sets the depth.
+        :param conservative: Only increase the lowest counters of a value,
+            which reduces the overestimation.
+        :return: Constructed object.
+        """
+        if not 0 < epsilon < 1 or not 0 < delta < 1:
+            raise ValueError(f'Unsupported epsilon {epsilon} or delta'
+                             f' {delta}.')
+        self.__desc: str = desc
+        self.__epsilon: float = epsilon
+        self.__delta: float = delta
+        self.__conservative: bool = conservative
+        self.__width: int = ceil(e / epsilon)
+        self.__depth: int = ceil(log(1 / delta))
+        self.__table = zeros((self.__depth, self.__width), dtype=int64)
+        self.__total: int = 0
+
+    def __str__(self) -> str:
+        """Return the description.
+
+        :return: The description.
+        """
+        return f'{self.__desc}'
+
+    def __repr__(self) -> str:
+        """Return the description and some details.
+
+        :return: The description and some details.
+        """
+        return f'{self.__desc} epsilon={self.__epsilon} delta={self.__delta}' \
+               f' width={self.__width} depth={self.__depth}' \
+               f' total={self.__total}'
+
+    def __add__(self, other: 'Sketch') -> 'Sketch':
+        """Return a new sketch with the combined counts of both.
+
+        :param other: The sketch to combine with.
+        :return: The combined sketch with the description of this one.
+        """
+        if not isinstance(other, Sketch):
+            return NotImplemented
+        res = Sketch(self.__desc, epsilon=self.__epsilon, delta=self.__delta,
+                     conservative=self.__conservative)
+        res.merge(self)
+        res.merge(other)
+        return res
+
+    def __iadd__(self, other: 'Sketch') -> 'Sketch':
+        """Merge the counts of another sketch into this one.
+
+        :param other: The sketch to merge.
+        :return: This sketch.
+        """
+        if not isinstance(other, Sketch):
+            return NotImplemented
+        self.merge(other)
+        return self
+
+    def __cells(self, value) -> list[int]:
+        """Return the counter in each row for a value.
+
+        One 128-bit hash is split into two, which are combined into one hash
+        per row. Values that are equal as dict keys, such as 1, 1.0, True and
+        NumPy scalars, are hashed the same, like Histogram counts them.
+
+        :param value: The value to hash.
+        :return: The index of the counter for the value in each row, in the
+            flattened table.
+        """
+        if isinstance(value, generic):
+            value = value.item()
+        if isinstance(value, bool) or \
+           isinstance(value, float) and value.is_integer():
+            value = int(value)
+        digest = blake2b(repr(value).encode('utf8'), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'little')
+        second = int.from_bytes(digest[8:], 'little') | 1
+        width = self.__width
+        return [row * width + (first + row * second) % width
+                for row in range(self.__depth)]
+
+    def total(self) -> int:
+        """Return the total count of all values added."""
+        return self.__total
+
+    def get(self, value) -> int:
+        """Return the estimated count of a value.
+
+        :param value: The value to get the count of.
+        :return: The estimated count, which is never too low.
+        """
+        return int(self.__table.reshape(-1)[self.__cells(value)].min())
+
+    def add(self, value, count: int = 1) -> None:
+        """Add a value by increasing its count in the sketch.
+
+        :param value: The str, bool, int or float to increment its count.
+        :param count: The number of occurrences to add, at least one.
+        """
+        if value in ('', None):
+            raise ValueError('Cannot add empty string or None to'
+                             f' "{self.__desc}".')
+        if count < 1:
+            raise ValueError(f'Cannot add count {count} to "{self.__desc}".')
+        cells = self.__cells(value)
+        counters = memoryview(self.__table.reshape(-1))
+        if self.__conservative:
+            low = min([counters[cell] for cell in cells]) + count
+            for cell in cells:
+                if counters[cell] < low:
+                    counters[cell] = low
+        else:
+            for cell in cells:
+                counters[cell] += count
+        self.__total += count
+
+    def update(self, values) -> None:
+        """Add many values at once, see also add().
+
+        The values are first counted, so that each unique value is hashed
+        only once, and then all counters are updated at once with NumPy.
+        With conservative update, the counters of each value are raised to
+        its estimate before the update plus its count, which never
+        underestimates a count, also when values share a counter.
+
+        :param values: An iterable of values, or a mapping of values to their
+            counts.
+        """
+        counts = Counter(values)
+        if '' in counts or None in counts:
+            raise ValueError('Cannot add empty string or None to'
+                             f' "{self.__desc}".')
+        if not counts:
+            return
+        low = min(counts.values())
+        if low < 1:
+            raise ValueError(f'Cannot add count {low} to "{self.__desc}".')
+        cells = array([self.__cells(value) for value in counts])
+        amounts = array(list(counts.values()), dtype=int64)[:, None]
+        table = self.__table.reshape(-1)
+        if self.__conservative:
+            maximum.at(table, cells,
+                       table[cells].min(axis=1, keepdims=True) + amounts)
+        else:
+            add.at(table, cells, amounts)
+        self.__total += sum(counts.values())
+
+    def merge(self, other: 'Sketch') -> None:
+        """Add all counts of another sketch to this sketch.
+
+        :param other: The sketch to merge, with the same epsilon and delta.
+        """
+        if self.__table.shape != other.__table.shape:
+            raise ValueError(f'Cannot merge "{other.__desc}" into'
+                             f' "{self.__desc}" because epsilon or delta'
+                             ' differs.')
+        self.__table += other.__table
+        self.__total += other.__total
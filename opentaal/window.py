@@ -0,0 +1,161 @@
+"""Class definition for Window."""
+
+from collections import Counter, deque
+from itertools import islice
+from time import monotonic
+from typing import Callable
+
+from opentaal import Histogram
+
+
+class Window():
+    """Class for a histogram of only the most recent values of a stream.
+
+    The window is either the last size values or the last seconds. It is kept
+    as a ring of slices, each a histogram of a part of the window, and a
+    histogram of the whole window. When the newest slice is full, the oldest
+    slice is subtracted from the whole and dropped. Each value is thus added
+    and removed only once, and queries use the index of the histogram of the
+    whole window.
+
+    Values expire a slice at a time, so the window holds at most size values
+    or seconds, and at least size or seconds divided by slices less. A value
+    added with a count above one counts as that many values.
+    """
+
+    def __init__(self, desc: str,
+                 size: int = None,
+                 seconds: float = None,
+                 slices: int = 8,
+                 chars: bool = True,
+                 clock: Callable = monotonic) -> None:
+        """Construct object and set its description.
+
+        :param desc: The description of the histogram.
+        :param size: The number of most recent values passed to add() or
+            update() to keep.
+        :param seconds: The number of most recent seconds to keep values of.
+        :param slices: The number of slices the window is divided in.
+        :param chars: Process characters or words, see also Histogram.
+        :param clock: A function that returns the current time in seconds.
+        :return: Constructed object.
+        """
+        if (size is None) == (seconds is None) or slices < 1 or \
+           (size is not None and size < slices) or \
+           (seconds is not None and seconds <= 0):
+            raise ValueError(f'Unsupported size {size}, seconds {seconds} or'
+                             f' slices {slices}.')
+        self.__desc: str = desc
+        self.__chars: bool = chars
+        self.__clock: Callable = clock
+        self.__slices: int = slices
+        self.__capacity: int = size // slices if size else None
+        self.__duration: float = seconds / slices if seconds else None
+        self.__filled: int = 0
+        self.__start: float = clock()
+        self.__total: Histogram = Histogram(desc, chars=chars)
+        self.__ring: deque = deque([Histogram(desc, chars=chars)])
+
+    def __len__(self) -> int:
+        """Return the number of unique values in the window."""
+        self.__advance()
+        return len(self.__total)
+
+    def __str__(self) -> str:
+        """Return the description.
+
+        :return: The description.
+        """
+        return f'{self.__desc}'
+
+    def __rotate(self) -> None:
+        """Start a new slice and drop the oldest one if the ring is full."""
+        self.__ring.append(Histogram(self.__desc, chars=self.__chars))
+        self.__filled = 0
+        if len(self.__ring) > self.__slices:
+            oldest = self.__ring.popleft()
+            if len(oldest):
+                self.__total.subtract(oldest)
+
+    def __advance(self) -> None:
+        """Drop the slices that have expired since the last call."""
+        if self.__duration is None:
+            return
+        steps = int((self.__clock() - self.__start) // self.__duration)
+        if steps <= 0:
+            return
+        self.__start += steps * self.__duration
+        if steps >= self.__slices:
+            self.__total = Histogram(self.__desc, chars=self.__chars)
+            self.__ring = deque([Histogram(self.__desc, chars=self.__chars)])
+            return
+        for _ in range(steps):
+            self.__rotate()
+
+    def histogram(self) -> Histogram:
+        """Return the histogram of the whole window, e.g. to export it.
+
+        :return: The histogram, which must not be changed.
+        """
+        self.__advance()
+        return self.__total
+
+    def get(self, value) -> int:
+        """Return the count of a value in the window."""
+        return self.histogram().get(value)
+
+    def minimum(self) -> int:
+        """Return the minimum count in the window."""
+        return self.histogram().minimum()
+
+    def maximum(self) -> int:
+        """Return the maximum count in the window."""
+        return self.histogram().maximum()
+
+    def top(self, number: int) -> list[tuple]:
+        """Return the values with the highest counts in the window.
+
+        :param number: The maximum number of values to return.
+        :return: A list of tuples of a value and its count, highest first.
+        """
+        return self.histogram().top(number)
+
+    def add(self, value, count: int = 1) -> None:
+        """Add a value to the newest slice, see also Histogram.add().
+
+        :param value: The str, bool, int or float to increment its count.
+        :param count: The number of occurrences to add, at least one.
+        """
+        self.__advance()
+        if self.__capacity is not None and \
+           self.__filled >= self.__capacity:
+            self.__rotate()
+        self.__ring[-1].add(value, count)
+        self.__total.add(value, count)
+        self.__filled += count
+
+    def update(self, values) -> None:
+        """Add many values at once, see also Histogram.update().
+
+        With a size, the values are split over as many slices as needed.
+
+        :param values: An iterable of values.
+        """
+        self.__advance()
+        if self.__capacity is None:
+            counts = Counter(values)
+            self.__ring[-1].update(counts)
+            self.__total.update(counts)
+            return
+        values = iter(values)
+        while True:
+            full = self.__filled >= self.__capacity
+            chunk = Counter(islice(values, self.__capacity if full else
+                                   self.__capacity - self.__filled))
+            if not chunk:
+                return
+            if full:
+                self.__rotate()
+            self.__ring[-1].update(chunk)
+            self.__total.update(chunk)
+            self.__filled += chunk.total()
@@ -29,6 +29,7 @@ setup(
         'hunspell',
         'gtts',
         'python-ucto',
+        'numpy',
         'py-gnuplot',
     ],
     keywords='Dutch histogram spelling Unicode sort',
@@ -0,0 +1,11 @@
+"""Class definition for Clock, used by tests of time-based classes."""
+
+
+class Clock():
+    """Clock that only moves when told to."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
@@ -29,6 +29,15 @@ def test_decode():
         assert Character.decode_category('Xx')
 
 
+def test_metadata():
+    assert Character.metadata('é') == ('LATIN SMALL LETTER E WITH ACUTE',
+                                       'Ll', 'letter', 'letter', 'U+C3A9',
+                                       'é')
+    assert Character.metadata(' ') == ('SPACE', 'Zs', 'whites.',
+                                       'whitespace', 'U+20', '␣')
+    assert Character.metadata(' ') is Character.metadata(' ')
+
+
 def test_to_hex():
     """Test the class Character."""
     assert Character.to_hex('k') == 'U+6B'
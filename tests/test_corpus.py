@@ -0,0 +1,76 @@
+"""Test class Corpus."""
+
+from os import listdir, makedirs, remove, utime
+from json import load
+from shutil import rmtree
+
+from opentaal import Corpus, Histogram, Progress, Word
+
+# pylint:disable=missing-function-docstring,unspecified-encoding
+
+
+def write(filename, text):
+    with open(filename, 'w') as file:
+        file.write(text)
+
+
+def test_update():
+    rmtree('/tmp/test_corpus_cache', ignore_errors=True)
+    rmtree('/tmp/test_corpus_texts', ignore_errors=True)
+    makedirs('/tmp/test_corpus_texts')
+    write('/tmp/test_corpus_texts/a.txt', 'tafel\nstoel\n')
+    write('/tmp/test_corpus_texts/b.txt', 'boek\ntafel\n')
+    corpus = Corpus('Corpus', '/tmp/test_corpus_cache', chars=False)
+    assert str(corpus) == 'Corpus'
+    hist = corpus.update('/tmp/test_corpus_texts')
+    assert hist.get('tafel') == 2
+    assert len(hist) == 3
+    with open('/tmp/test_corpus_cache/manifest.json') as file:
+        assert load(file)['files']['/tmp/test_corpus_texts/a.txt'][2] == \
+            Word.checksum('tafel\nstoel\n')
+
+    write('/tmp/test_corpus_texts/b.txt', 'boek\nraam\n')
+    utime('/tmp/test_corpus_texts/b.txt', ns=(0, 0))
+    write('/tmp/test_corpus_texts/c.txt', 'tafel\nstoel\n')
+    reports = []
+    hist = corpus.update('/tmp/test_corpus_texts',
+                         progress=Progress(reports.append))
+    assert reports[-1].size() == reports[-1].total() == 22
+    assert reports[-1].lines() == 4
+    assert hist.get('tafel') == 2
+    assert hist.get('stoel') == 2
+    assert hist.get('raam') == 1
+    assert len(hist) == 4
+    assert hist.maximum() == 2
+    assert hist.top(4)[2:] == [('boek', 1), ('raam', 1)]
+
+    remove('/tmp/test_corpus_texts/a.txt')
+    hist = corpus.update('/tmp/test_corpus_texts')
+    assert hist.get('tafel') == 1
+    assert hist.get('stoel') == 1
+    assert hist.get('boek') == 1
+    assert len(hist) == 4
+    assert hist.maximum() == 1
+
+    remove('/tmp/test_corpus_cache/corpus.hist')
+    hist = Corpus('Rebuilt', '/tmp/test_corpus_cache',
+                  chars=False).update('/tmp/test_corpus_texts')
+    assert str(hist) == 'Rebuilt'
+    assert hist.get('tafel') == 1
+    assert len(hist) == 4
+    stale = Histogram('Stale', chars=False)
+    stale.update(['tafel'] * 5)
+    stale.save('/tmp/test_corpus_cache/corpus.hist')
+    hist = Corpus('Crashed', '/tmp/test_corpus_cache',
+                  chars=False).update('/tmp/test_corpus_texts')
+    assert hist.get('tafel') == 1
+    assert len(hist) == 4
+    assert not [name for name in listdir('/tmp/test_corpus_cache')
+                if name.endswith('.tmp')]
+    hist = Corpus('Chars', '/tmp/test_corpus_cache').update(
+        '/tmp/test_corpus_texts')
+    assert hist.get('a') == 3
+    assert sorted(hist.top(len(hist))) == sorted(Histogram.from_paths(
+        'Chars', '/tmp/test_corpus_texts', jobs=1).top(len(hist)))
+
+# pylint:enable=missing-function-docstring,unspecified-encoding
@@ -82,6 +82,18 @@ def test_credentials_exisiting_parent(creds):
     assert Database.credentials('tmp_database.cnf', parent=True) == creds
     chdir(original)
 
+
+def test_connect(creds):
+    filename = join(dirname(realpath(__file__)), '..', 'tmp_database.cnf')
+    args = Database.connect(filename, connector=dict)
+    assert args == {**creds, 'port': 54321}
+    with open('/tmp/test_connect.cnf', 'w') as file:  # pylint:disable=W1514
+        file.write("[client]\nuser = 'testuser'\npassword = 'testpassword'"
+                   "\ndatabase = '/tmp/test_connect.sqlite'\n")
+    conn = Database.connect('/tmp/test_connect.cnf')
+    assert conn.execute('SELECT 1').fetchone() == (1,)
+    conn.close()
+
 # pylint:enable=redefined-outer-name
 
 # pylint:enable=missing-function-docstring
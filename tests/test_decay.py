@@ -0,0 +1,74 @@
+"""Test class Decay."""
+
+from pytest import approx, raises
+
+from opentaal import Decay
+from tests.clock import Clock
+
+# pylint:disable=missing-function-docstring
+
+
+def test_members():
+    decay = Decay('Empty', halflife=1)
+    assert str(decay) == 'Empty'
+    assert len(decay) == 0
+    assert decay.get('a') == 0
+    assert decay.minimum() == 0
+    assert decay.maximum() == 0
+    with raises(ValueError, match='Unsupported halflife 0.'):
+        assert Decay('Zero', halflife=0)
+    with raises(ValueError, match='Cannot add empty string or None to'
+                ' "Empty".'):
+        decay.add('')
+    with raises(ValueError, match='Cannot add count 0 to "Empty".'):
+        decay.add('a', count=0)
+
+
+def test_decay():
+    clock = Clock()
+    decay = Decay('Words', halflife=10, chars=False, clock=clock)
+    decay.update(['tafel', 'tafel', 'stoel'])
+    clock.now = 10.0
+    assert decay.get('tafel') == approx(1)
+    decay.add('stoel', count=2)
+    assert decay.top(2) == [('stoel', approx(2.5)), ('tafel', approx(1))]
+    assert decay.maximum() == approx(2.5)
+    assert decay.minimum() == approx(1)
+    for _ in range(100):
+        decay.add('tafel')
+    assert decay.minimum() == approx(2.5)
+    decay.add('kast')
+    assert decay.minimum() == approx(1)
+    clock.now = 20.0
+    assert decay.get('stoel') == approx(1.25)
+    chars = Decay('Chars', halflife=10, clock=clock)
+    chars.add('tafel')
+    assert chars.get('a') == approx(1)
+
+
+def test_renormalize():
+    clock = Clock()
+    decay = Decay('Renormalize', halflife=1, chars=False, clock=clock)
+    decay.add('tafel', count=1000)
+    decay.add('stoel')
+    clock.now = 40.0
+    decay.add('kast')
+    assert len(decay) == 1
+    assert decay.get('kast') == approx(1)
+    assert decay.maximum() == approx(1)
+    clock.now = 41.0
+    assert decay.get('kast') == approx(0.5)
+    clock.now = 72.0
+    decay.add('bank')
+    clock.now = 73.0
+    assert decay.get('bank') == approx(0.5)
+    assert decay.get('bank') == approx(0.5)
+    clock.now = 105.0
+    assert decay.minimum() == approx(2 ** -33)
+    clock.now = 2105.0
+    assert decay.maximum() == 0
+    assert len(decay) == 0
+    decay.add('raam')
+    assert decay.get('raam') == approx(1)
+
+# pylint:enable=missing-function-docstring
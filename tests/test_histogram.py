@@ -1,10 +1,19 @@
 """Test class Histogram."""
 
+from array import array
+from asyncio import run, sleep, wait_for
+from json import loads
+from locale import LC_ALL, setlocale
+from bz2 import open as bz2_open
+from gzip import open as gzip_open
+from lzma import FORMAT_ALONE, open as lzma_open
 from random import randint, seed  # , random
-from os import chdir, getcwd
+from os import chdir, getcwd, makedirs, remove
+from os.path import isfile
+from sqlite3 import connect
 from pytest import fixture, raises
 
-from opentaal import Histogram
+from opentaal import Histogram, Sorter
 
 # pylint:disable=missing-function-docstring
 
@@ -188,6 +197,356 @@ def test_init_file():
     hist.to_graphfile('/tmp/test_from_file.svg', term='svg')
 
 
+def test_init_file_blocks(monkeypatch):
+    text = 'tafel\nstoel\nboek\ngoederentrein\nraam\ntafel\nstoel'
+    with open('/tmp/test_blocks.txt', 'w') as file:
+        file.write(text)
+    monkeypatch.setattr(Histogram, 'BLOCK_SIZE', 4)
+    hist = Histogram('Blocks', filename='/tmp/test_blocks.txt', chars=False)
+    assert len(hist) == 5
+    assert hist.get('stoel') == 2
+    assert hist.get('goederentrein') == 1
+    assert hist.minimum() == 1
+    assert hist.maximum() == 2
+    hist = Histogram('Blocks', filename='/tmp/test_blocks.txt')
+    for char in set(text) - {'\n'}:
+        assert hist.get(char) == text.count(char)
+    assert hist.get('\n') == 0
+
+
+def test_init_file_empty_line():
+    with open('/tmp/test_empty_line.txt', 'w') as file:
+        file.write('tafel\n\nstoel\n')
+    with raises(ValueError, match='Cannot add empty string or None to'
+                ' "Empty line".'):
+        assert Histogram('Empty line', filename='/tmp/test_empty_line.txt',
+                         chars=False)
+    hist = Histogram('Empty line', filename='/tmp/test_empty_line.txt')
+    assert hist.get('e') == 2
+
+
+def test_from_paths():
+    makedirs('/tmp/test_corpus/sub', exist_ok=True)
+    texts = ('tafel\nstoel\n', 'boek\n' * 100, 'raam\ntafel\n')
+    names = ('/tmp/test_corpus/a.txt', '/tmp/test_corpus/sub/b.txt',
+             '/tmp/test_corpus/c.txt')
+    for name, text in zip(names, texts):
+        with open(name, 'w') as file:
+            file.write(text)
+    with open('/tmp/test_corpus/ignored.html', 'w') as file:
+        file.write('<html>\n')
+    hist = Histogram.from_paths('Corpus', '/tmp/test_corpus', chars=False,
+                                jobs=2)
+    assert len(hist) == 4
+    assert hist.get('boek') == 100
+    assert hist.get('tafel') == 2
+    assert hist.get('<html>') == 0
+    hist = Histogram.from_paths('Corpus', names, jobs=1)
+    assert hist.get('o') == 101
+    assert hist.maximum() == 103
+    with raises(ValueError, match='Unsupported jobs 0.'):
+        assert Histogram.from_paths('None', names, jobs=0)
+
+
+def test_init_file_numpy(monkeypatch):
+    text = 'één tafel\nstoel 😀\nboek\tgoederentrein\n'
+    with open('/tmp/test_numpy.txt', 'w') as file:
+        file.write(text * 3)
+    monkeypatch.setattr(Histogram, 'BLOCK_SIZE', 7)
+    python = Histogram('Python', filename='/tmp/test_numpy.txt')
+    numpy = Histogram('NumPy', filename='/tmp/test_numpy.txt',
+                      backend='numpy')
+    assert len(numpy) == len(python)
+    for char in set(text):
+        assert numpy.get(char) == python.get(char)
+    assert numpy.get('😀') == 3
+    assert numpy.get('\n') == 0
+    with raises(ValueError, match='Unsupported backend gpu.'):
+        assert Histogram('GPU', backend='gpu')
+
+
+def test_init_file_mapped(monkeypatch):
+    text = 'één tafel\r\nstoel 😀\nboek\ngoederentrein\n'
+    with open('/tmp/test_mapped.txt', 'w', encoding='utf-8',
+              newline='') as file:
+        file.write(text * 3)
+    monkeypatch.setattr(Histogram, 'BLOCK_SIZE', 3)
+    for chars in (True, False):
+        read = Histogram('Read', filename='/tmp/test_mapped.txt',
+                         chars=chars)
+        mapped = Histogram('Mapped', filename='/tmp/test_mapped.txt',
+                           chars=chars, mapped=True)
+        assert len(mapped) == len(read)
+        for value in set(text) | set(text.replace('\r', '').split('\n')):
+            assert mapped.get(value) == read.get(value)
+    assert mapped.get('één tafel') == 3
+    with open('/tmp/test_mapped.txt', 'w') as file:
+        pass
+    assert len(Histogram('Empty', filename='/tmp/test_mapped.txt',
+                         mapped=True)) == 0
+
+
+def test_to_files_streamed(monkeypatch):
+    monkeypatch.setattr(Histogram, 'BATCH_SIZE', 2)
+    hist = Histogram('Streamed', chars=False)
+    hist.update(['tafel', 'stoel', 'tafel', 'boek', 'raam'])
+    assert hist.to_tsvfile('/tmp/test_streamed.tsv', unicode=False) == (1, 2)
+    with open('/tmp/test_streamed.tsv') as file:
+        assert file.read() == hist.to_tsvstring(desc=False, unicode=False)[0]
+    hist.to_mdfile('/tmp/test_streamed.md', unicode=False)
+    with open('/tmp/test_streamed.md') as file:
+        assert file.read() == hist.to_mdstring(unicode=False)
+    hist.to_jsonfile('/tmp/test_streamed.json', unicode=False)
+    with open('/tmp/test_streamed.json') as file:
+        assert file.read() == hist.to_jsonstring(unicode=False)
+    assert hist.to_jsonstring(unicode=False).startswith(
+        '{\n  "description": "Streamed",\n  "data": [\n    {\n'
+        '      "count": 2,\n      "value": "tafel"\n    },\n    {\n')
+
+
+def test_ngram(monkeypatch):
+    text = 'de tafel en de stoel\nde tafel\nen de stoel van de tafel'
+    with open('/tmp/test_ngram.txt', 'w') as file:
+        file.write(text)
+    monkeypatch.setattr(Histogram, 'BLOCK_SIZE', 4)
+    hist = Histogram('Bigrams', filename='/tmp/test_ngram.txt', ngram=2)
+    for line in text.split('\n'):
+        for i in range(len(line) - 1):
+            assert hist.get(line[i:i + 2]) == sum(
+                part.count(line[i:i + 2]) for part in text.split('\n'))
+    assert hist.get('l\n') == 0
+    assert hist.top(1) == [('de', 5)]
+    hist = Histogram('Word bigrams', filename='/tmp/test_ngram.txt',
+                     chars=False, ngram=2)
+    assert hist.top(1) == [('de tafel', 3)]
+    assert hist.get('de stoel') == 2
+    assert hist.get('stoel de') == 0
+    assert hist.get('stoel van') == 1
+    mapped = Histogram('Mapped', filename='/tmp/test_ngram.txt',
+                       chars=False, ngram=2, mapped=True)
+    assert mapped.top(len(hist)) == hist.top(len(hist))
+    hist = Histogram('Trigrams', ngram=3)
+    hist.add('tafel')
+    hist.update(['fel', 'te'])
+    assert hist.top(3) == [('fel', 2), ('taf', 1), ('afe', 1)]
+    with raises(ValueError, match='Unsupported ngram 0.'):
+        assert Histogram('Zero', ngram=0)
+
+
+async def blocks(*texts):
+    for text in texts:
+        await sleep(0)
+        yield text
+
+
+def test_aingest(monkeypatch):
+    monkeypatch.setattr(Histogram, 'BLOCK_SIZE', 3)
+    hist = Histogram('Async', chars=False)
+    run(hist.aingest(blocks(b'de taf', 'el\r\nde st'.encode('utf8'),
+                            b'oel\n\xc3', b'\xa9\xc3\xa9n')))
+    assert sorted(hist.top(3)) == [('de stoel', 1), ('de tafel', 1),
+                                   ('één', 1)]
+    hist = Histogram('Many', chars=False)
+    run(hist.aingest_many([blocks('de taf', 'el\nde st', 'oel'),
+                           blocks('de st', 'oel\nde tafel\n'),
+                           blocks()], maxsize=1))
+    assert sorted(hist.top(2)) == [('de stoel', 2), ('de tafel', 2)]
+    chars = Histogram('Chars', edges=[0, 5, 10])
+    run(chars.aingest_many([blocks('taf', 'el\n'), blocks('tafel')]))
+    assert chars.get('a') == 2
+    assert chars.get('\n') == 0
+
+    async def broken():
+        yield 'tafel'
+        raise OSError('Connection lost')
+    with raises(OSError, match='Connection lost'):
+        run(chars.aingest_many([blocks('stoel'), broken()]))
+
+    async def endless():
+        while True:
+            yield 'tafel\n'
+            await sleep(0.001)
+    with raises(OSError, match='Connection lost'):
+        run(wait_for(chars.aingest_many([endless(), broken()]), 5))
+
+
+def test_top_min_count():
+    hist = Histogram('Truncated', chars=False)
+    hist.update(['tafel'] * 5 + ['stoel'] * 3 + ['kast'] * 3 + ['bank'])
+    assert hist.to_tsvstring(desc=False, unicode=False, top=2) == \
+        ('count\tvalue\n      5\ttafel\n      3\tkast\n', 1, 5)
+    assert hist.to_string(head=False, unicode=False, reverse=False,
+                          top=3) == 'Truncated\n      3\tkast\n' \
+        '      3\tstoel\n      5\ttafel\n'
+    assert hist.to_mdstring(desc=False, unicode=False, min_count=3) == \
+        'count | value\n--: | ---\n`5` | `tafel`\n`3` | `kast`\n' \
+        '`3` | `stoel`\n'
+    assert hist.to_mdstring(desc=False, unicode=False, reverse=False,
+                            min_count=2) == 'count | value\n--: | ---\n' \
+        '`3` | `kast`\n`3` | `stoel`\n`5` | `tafel`\n'
+    json = hist.to_jsonstring(desc=False, unicode=False, top=1)
+    assert '"value": "tafel"' in json and '"stoel"' not in json
+    assert '"unique": 4,\n  "minimum": 1,\n  "maximum": 5\n' in json
+    assert hist.to_string(unicode=False, top=10, min_count=6) == \
+        'Truncated\ncount\tvalue\n'
+    hist.to_tsvfile('/tmp/test_top.tsv', unicode=False, top=2)
+    with open('/tmp/test_top.tsv') as file:
+        assert file.read() == 'count\tvalue\n      5\ttafel\n' \
+            '      3\tkast\n'
+    hist.to_mdfile('/tmp/test_top.md', unicode=False, min_count=5)
+    hist.to_jsonfile('/tmp/test_top.json', unicode=False, top=2)
+    hist.to_graphfile('/tmp/test_top.png', unicode=False, top=2)
+
+
+def test_collation(monkeypatch):
+    hist = Histogram('Collated', chars=False)
+    hist.update(['zee', 'bank', 'appel', 'zee', 'kast'])
+    other = Histogram('Collated', chars=False)
+    other.update(['kast', 'zee', 'appel', 'bank', 'zee'])
+    res = hist.to_tsvstring(desc=False, unicode=False)
+    assert res == other.to_tsvstring(desc=False, unicode=False)
+    assert res[0].split('\n')[2:] == \
+        ['      1\tappel', '      1\tbank', '      1\tkast', '']
+    assert hist.to_tsvstring(desc=False, unicode=False) == res
+    assert hist.top(2) == [('zee', 2), ('bank', 1)]
+    hist.update(['kast', 'appel'])
+    removed = Histogram('Removed', chars=False)
+    removed.update(['zee', 'bank'])
+    hist.subtract(removed)
+    assert hist.to_string(head=False, unicode=False) == 'Collated\n' \
+        '      2\tappel\n      2\tkast\n      1\tzee\n'
+    numbers = Histogram('Numbers')
+    numbers.update([3, 1.5, 2, 3])
+    assert numbers.to_mdstring(desc=False, unicode=False,
+                               reverse=False) == 'count | value\n--: | ---\n' \
+        '`1` | `1.5`\n`1` | `2`\n`2` | `3`\n'
+    cased = Histogram('Cased', chars=False)
+    cased.update(['bank', 'Bank', 'appel'])
+    monkeypatch.setattr(Sorter, 'key', None)
+    before = setlocale(LC_ALL)
+    assert cased.to_tsvstring(desc=False, head=False, unicode=False)[0] == \
+        '      1\tBank\n      1\tappel\n      1\tbank\n'
+    assert setlocale(LC_ALL) == before
+    monkeypatch.setattr(Sorter, 'key', str.casefold)
+    assert cased.to_tsvstring(desc=False, head=False, unicode=False)[0] == \
+        '      1\tappel\n      1\tBank\n      1\tbank\n'
+
+
+def test_compressed(monkeypatch):
+    text = 'tafel\r\nstoel\néén\ntafel\n' * 100
+    makedirs('/tmp/test_compressed', exist_ok=True)
+    for name, opener in (('a.txt.gz', gzip_open), ('b.txt.bz2', bz2_open),
+                         ('c.txt.xz', lzma_open), ('d.gz', gzip_open)):
+        with opener(f'/tmp/test_compressed/{name}', 'wb') as file:
+            file.write(text.encode('utf8'))
+    with gzip_open('/tmp/test_compressed/e.txt.gz', 'wb') as file:
+        file.write(b'')
+    assert Histogram.compression('/tmp/test_compressed/a.txt.gz') == 'gzip'
+    assert Histogram.compression('/tmp/test_compressed/b.txt.bz2') == 'bz2'
+    assert Histogram.compression('/tmp/test_compressed/c.txt.xz') == 'lzma'
+    with open('/tmp/test_plain.gz', 'w') as file:
+        file.write('tafel\n')
+    assert Histogram.compression('/tmp/test_plain.gz') is None
+    with open('/tmp/test_plain.txt', 'w') as file:
+        file.write('BZh is een afkorting\n')
+    assert Histogram.compression('/tmp/test_plain.txt') is None
+    assert Histogram('Plain', filename='/tmp/test_plain.txt',
+                     chars=False).get('BZh is een afkorting') == 1
+    with bz2_open('/tmp/test_empty.bz2', 'wb') as file:
+        file.write(b'')
+    assert Histogram.compression('/tmp/test_empty.bz2') == 'bz2'
+    assert Histogram('Plain', filename='/tmp/test_plain.gz',
+                     chars=False).get('tafel') == 1
+    with lzma_open('/tmp/test_legacy.lzma', 'wb', format=FORMAT_ALONE) as file:
+        file.write(b'tafel\n')
+    assert Histogram.compression('/tmp/test_legacy.lzma') == 'lzma'
+    monkeypatch.setattr(Histogram, 'BLOCK_SIZE', 7)
+    monkeypatch.setattr(Histogram, 'QUEUE_SIZE', 2)
+    hist = Histogram('Gzip', filename='/tmp/test_compressed/d.gz',
+                     chars=False, mapped=True)
+    assert hist.top(2) == [('tafel', 200), ('stoel', 100)]
+    assert hist.get('één') == 100
+    hist = Histogram.from_paths('Compressed', '/tmp/test_compressed',
+                                chars=False, jobs=1)
+    assert hist.top(3) == [('tafel', 600), ('stoel', 300), ('één', 300)]
+    blocks = Histogram.read_blocks('/tmp/test_compressed/c.txt.xz')
+    assert next(blocks) == 'tafel\n'
+    blocks.close()
+    with open('/tmp/test_broken.txt.gz', 'wb') as file:
+        file.write(b'\x1f\x8b broken')
+    with raises((OSError, EOFError)):
+        assert Histogram('Broken', filename='/tmp/test_broken.txt.gz')
+
+
+def test_sqlite():
+    if isfile('/tmp/test_sqlite.db'):
+        remove('/tmp/test_sqlite.db')
+    chars = Histogram('Chars')
+    chars.update(['tafel', 'één', '\t'])
+    chars.to_sqlite('/tmp/test_sqlite.db', table='chars')
+    chars.to_sqlite('/tmp/test_sqlite.db', table='chars')
+    loaded = Histogram.from_sqlite('/tmp/test_sqlite.db', table='chars')
+    assert str(loaded) == 'chars'
+    assert sorted(loaded.top(len(loaded))) == \
+        sorted((value, 2 * count) for value, count in chars.top(len(chars)))
+    conn = connect('/tmp/test_sqlite.db')
+    assert conn.execute("SELECT * FROM chars WHERE value = 'é'").fetchone() \
+        == ('é', 4, 'U+C3A9', 'letter', 'LATIN SMALL LETTER E WITH ACUTE')
+    assert conn.execute("SELECT * FROM chars WHERE value = '\t'").fetchone() \
+        == ('\t', 2, None, None, None)
+    words = Histogram('Words', chars=False)
+    words.update(['tafel', 'Tafel', 'tafel'])
+    words.to_sqlite(conn, table='words', unicode=False)
+    loaded = Histogram.from_sqlite(conn, table='words', desc='Loaded',
+                                   chars=False)
+    assert loaded.top(2) == [('tafel', 2), ('Tafel', 1)]
+    with raises(ValueError, match='Unsupported table words;.'):
+        words.to_sqlite(conn, table='words;')
+    conn.close()
+
+
+def test_json_escape_lines():
+    words = Histogram('Quote "and" \\', chars=False)
+    words.update(['"tafel"', 'back\\slash', '"tafel"'])
+    data = loads(words.to_jsonstring(unicode=False))
+    assert data['description'] == 'Quote "and" \\'
+    assert data['data'] == [{'count': 2, 'value': '"tafel"'},
+                            {'count': 1, 'value': 'back\\slash'}]
+    assert words.to_jsonstring(unicode=False, lines=True) == \
+        '{"count": 2, "value": "\\"tafel\\""}\n' \
+        '{"count": 1, "value": "back\\\\slash"}\n'
+    words.to_jsonfile('/tmp/test_lines.jsonl', unicode=False, lines=True)
+    loaded = Histogram.from_json('/tmp/test_lines.jsonl', chars=False,
+                                 lines=True)
+    assert str(loaded) == '/tmp/test_lines.jsonl'
+    assert loaded.top(2) == words.top(2)
+    chars = Histogram('Chars')
+    chars.update(['"é"', '"'])
+    lines = chars.to_jsonstring(lines=True, top=1).splitlines()
+    assert loads(lines[0])['value'] == '"'
+    assert loads(lines[0])['codepoint'] == 'U+22'
+    assert loads(chars.to_jsonstring(multi=False, lines=True,
+                                     min_count=3))['count'] == 3
+    chars.to_jsonfile('/tmp/test_lines.jsonl', lines=True)
+    loaded = Histogram.from_json('/tmp/test_lines.jsonl', lines=True)
+    assert loaded.top(2) == chars.top(2)
+
+
+def test_feed_flush():
+    hist = Histogram('Fed', chars=False)
+    for block in ('de taf', 'el\nde st', 'oel\nde tafel'):
+        hist.feed(block)
+    assert len(hist) == 0
+    hist.flush()
+    assert hist.top(2) == [('de tafel', 2), ('de stoel', 1)]
+    hist = Histogram('Fed chars')
+    hist.feed('taf')
+    hist.feed('el\n')
+    hist.flush()
+    assert hist.get('a') == 1
+    assert hist.get('\n') == 0
+
+
 # def test_random_int():
 #     hist = Histogram('Test randomm int')
 #     seed(2.71828)
@@ -226,6 +585,302 @@ def test_init_file():
 # pylint:enable=unspecified-encoding
 
 
+def test_add_count():
+    hist = Histogram('Add count', chars=False)
+    hist.add('tafel')
+    assert hist.maximum() == 1
+    hist.add('tafel', count=3)
+    assert hist.get('tafel') == 4
+    assert hist.maximum() == 4
+    with raises(ValueError, match='Cannot add count 0 to "Add count".'):
+        assert hist.add('stoel', count=0)
+
+
+def test_update():
+    hist = Histogram('Update')
+    hist.update(['tafel', 'stoel'])
+    assert hist.get('e') == 2
+    assert hist.get('t') == 2
+    hist.update({'a': 5})
+    assert hist.get('a') == 6
+    assert hist.maximum() == 6
+    hist = Histogram('Update', chars=False)
+    hist.update(['tafel', 'stoel', 'tafel'])
+    assert len(hist) == 2
+    assert hist.get('tafel') == 2
+    assert hist.minimum() == 1
+    with raises(ValueError, match='Cannot add empty string or None to'
+                ' "Update".'):
+        assert hist.update(['boek', ''])
+
+
+def test_merge():
+    first = Histogram('First', chars=False)
+    first.update(['tafel', 'stoel'])
+    second = Histogram('Second', chars=False)
+    second.update(['tafel', 'boek'])
+    both = first + second
+    assert str(both) == 'First'
+    assert len(both) == 3
+    assert both.get('tafel') == 2
+    assert both.maximum() == 2
+    assert first.get('tafel') == 1
+    assert first.maximum() == 1
+    first += second
+    assert first.get('tafel') == 2
+    assert first.maximum() == 2
+    assert first.minimum() == 1
+    with raises(ValueError, match='Cannot merge "Chars" into "First" because'
+                ' chars differs.'):
+        first.merge(Histogram('Chars'))
+    with raises(TypeError):
+        assert first + 1
+
+
+def test_subtract():
+    hist = Histogram('Subtract', chars=False)
+    hist.update(['tafel', 'tafel', 'stoel', 'boek'])
+    part = Histogram('Part', chars=False)
+    part.update(['tafel', 'boek'])
+    hist.subtract(part)
+    assert len(hist) == 2
+    assert hist.get('tafel') == 1
+    assert hist.get('boek') == 0
+    assert hist.maximum() == 1
+    with raises(ValueError, match='Cannot subtract "Part" from "Subtract"'
+                ' because the count of boek would be negative.'):
+        hist.subtract(part)
+    assert hist.get('tafel') == 1
+    bigrams = Histogram('Bigrams', chars=False, ngram=2)
+    bigrams.update(['de tafel'])
+    with raises(ValueError, match='Cannot subtract "Bigrams" from "Subtract"'
+                ' because binning or ngram differs.'):
+        hist.subtract(bigrams)
+    lower = Histogram('Lower', chars=False)
+    lower.update({'a': 1, 'b': 3, 'c': 5})
+    part = Histogram('Part', chars=False)
+    part.update({'c': 3})
+    lower.subtract(part)
+    assert lower.maximum() == 3
+    assert lower.top(3) == [('b', 3), ('c', 2), ('a', 1)]
+    assert lower.to_string(head=False, unicode=False) == 'Lower\n' \
+        '      3\tb\n      2\tc\n      1\ta\n'
+
+
+def test_order_statistics():
+    hist = Histogram('Order', chars=False)
+    assert hist.top(3) == []
+    assert hist.percentile(50) == 0
+    hist.update(['tafel'] * 5 + ['stoel'] * 3 + ['boek'] * 3 + ['raam'])
+    assert hist.minimum() == 1
+    assert hist.maximum() == 5
+    assert hist.top(2) == [('tafel', 5), ('stoel', 3)]
+    assert hist.bottom(2) == [('raam', 1), ('stoel', 3)]
+    assert hist.rank('tafel') == 1
+    assert hist.rank('boek') == 2
+    assert hist.rank('raam') == 4
+    assert hist.rank('deur') == 0
+    assert hist.percentile(25) == 1
+    assert hist.percentile(50) == 3
+    assert hist.percentile(100) == 5
+    hist.add('raam', count=9)
+    assert hist.maximum() == 10
+    assert hist.minimum() == 3
+    assert hist.top(1) == [('raam', 10)]
+    assert hist.rank('tafel') == 2
+    with raises(ValueError, match='Unsupported percentage 101.'):
+        assert hist.percentile(101)
+    hist.update({'stoel': 1})
+    hist.update({f'woord{i}': i % 5 + 1 for i in range(100)})
+    hist.update({'boek': 20})
+    hist.add('stoel', count=2)
+    assert hist.top(3) == [('boek', 23), ('raam', 10), ('stoel', 6)]
+    assert hist.minimum() == 1
+    assert hist.rank('tafel') == 4
+    assert hist.percentile(100) == 23
+
+
+def test_capacity():
+    seed(2.71828)
+    words = [f'woord{randint(1, 3) if randint(0, 1) else randint(4, 200)}'
+             for _ in range(5000)]
+    exact = Histogram('Exact', chars=False)
+    exact.update(words)
+    first = Histogram('First', chars=False, capacity=10)
+    for word in words[:2500]:
+        first.add(word)
+    assert len(first) == 10
+    second = Histogram('Second', chars=False, capacity=10)
+    second.update(words[2500:])
+    assert len(second) == 10
+    for hist in (first, second, first + second):
+        assert len(hist) == 10
+    hist = first + second
+    for word in ('woord1', 'woord2', 'woord3'):
+        assert hist.get(word) - hist.error(word) <= exact.get(word) <= \
+            hist.get(word)
+    assert hist.minimum() <= len(words) // 10
+    for word in ('woord4', 'woord100', 'woord200'):
+        if hist.get(word) == 0:
+            assert exact.get(word) <= hist.minimum()
+    first.merge(second)
+    assert first.get('woord1') == hist.get('woord1')
+    assert exact.error('woord1') == 0
+    fed = Histogram('Fed', chars=False, capacity=10)
+    text = '\n'.join(words)
+    for start in range(0, len(text), 1000):
+        fed.feed(text[start:start + 1000])
+        assert len(fed) <= 10
+    fed.flush()
+    assert len(fed) == 10
+    assert sum(fed.top(10)[i][1] for i in range(10)) == len(words)
+    for word in ('woord1', 'woord2', 'woord3'):
+        assert fed.get(word) - fed.error(word) <= exact.get(word) <= \
+            fed.get(word)
+    with raises(ValueError, match='Unsupported capacity 0.'):
+        assert Histogram('Zero', capacity=0)
+
+
+def test_binning():
+    hist = Histogram('Width', width=10)
+    hist.add(3)
+    hist.update([7, 12, 19, 20])
+    hist.add_array(array('i', [1, 25, 29]))
+    assert len(hist) == 3
+    assert hist.get(0) == 3
+    assert hist.get(10) == 2
+    assert hist.get(20) == 3
+    hist = Histogram('Float width', width=0.1)
+    hist.update([0.3, 0.7, 0.05])
+    hist.add_array([0.3, 0.7, 0.65, 0.6])
+    assert hist.get(0.3) == 2
+    assert hist.get(0.7) == 2
+    assert hist.get(0.6) == 2
+    assert hist.get(0.0) == 1
+    assert len(hist) == 4
+    hist = Histogram('Base', base=10)
+    hist.update([1, 9, 10, 99.5, 1000])
+    hist.add_array([2, 1000, 5000])
+    assert hist.get(1) == 3
+    assert hist.get(10) == 2
+    assert hist.get(1000) == 3
+    with raises(ValueError, match='Cannot add 0 to logarithmic bins of'
+                ' "Base".'):
+        assert hist.add(0)
+    hist = Histogram('Edges', edges=[0, 1, 5, 10])
+    hist.update([0, 0.5, 1, 4.9, 10])
+    hist.add_array([2, 10])
+    assert hist.to_string(unicode=False) == 'Edges\ncount\tvalue' \
+        '\n      3\t1\n      2\t0\n      2\t5\n'
+    hist = hist + hist
+    assert hist.get(1) == 6
+    with raises(ValueError, match='Cannot add 11 outside the edges of'
+                ' "Edges".'):
+        assert hist.add(11)
+    with raises(ValueError, match='Cannot add values outside the edges of'
+                ' "Edges".'):
+        assert hist.add_array([-1])
+    with raises(ValueError, match='Use only one of width, base and edges.'):
+        assert Histogram('Both', width=1, base=2)
+    with raises(ValueError, match='Unsupported width, base or edges.'):
+        assert Histogram('Descending', edges=[2, 1])
+    with raises(ValueError, match='Cannot merge "Width" into "Edges" because'
+                ' binning or ngram differs.'):
+        hist.merge(Histogram('Width', width=10))
+    hist = Histogram('None')
+    hist.add_array([1, 2, 2])
+    assert hist.get(2) == 2
+
+
+def test_save_load():
+    chars = Histogram('Chars ë')
+    chars.update(['één tafel', 'stoel 😀'])
+    words = Histogram('Words', chars=False)
+    words.update(['tafel', 'stoel', 'tafel', 'één 😀'])
+    ints = Histogram('Ints', chars=False)
+    ints.update([-300, 0, 1, 1, 70000])
+    floats = Histogram('Floats', width=0.5)
+    floats.update([0.1, 0.7, 0.2])
+    bools = Histogram('Bools')
+    bools.update([True, False, True])
+    for hist in (chars, words, ints, floats, bools, Histogram('Empty')):
+        for compress in (True, False):
+            hist.save('/tmp/test_save.hist', compress=compress)
+            loaded = Histogram.load('/tmp/test_save.hist')
+            assert repr(loaded) == repr(hist)
+            assert loaded.top(len(hist)) == hist.top(len(hist))
+    floats.save('/tmp/test_save.hist')
+    loaded = Histogram.load('/tmp/test_save.hist')
+    loaded.add(0.3)
+    assert loaded.get(0.0) == 3
+    assert len(loaded) == 2
+    edges = Histogram('Edges', edges=[0, 1, 5])
+    edges.update([0, 2, 4])
+    edges.save('/tmp/test_save.hist')
+    assert (Histogram.load('/tmp/test_save.hist') + edges).top(2) == \
+        [(1, 4), (0, 2)]
+    bigrams = Histogram('Bigrams', chars=False, ngram=2)
+    bigrams.update(['de tafel en de stoel'])
+    bigrams.save('/tmp/test_save.hist')
+    loaded = Histogram.load('/tmp/test_save.hist')
+    loaded.add('de tafel')
+    assert loaded.get('de tafel') == 2
+    capped = Histogram('Capped', chars=False, capacity=2)
+    capped.update(['tafel', 'tafel', 'stoel', 'kast'])
+    assert capped.error('kast') == 1
+    capped.save('/tmp/test_save.hist')
+    loaded = Histogram.load('/tmp/test_save.hist')
+    assert loaded.error('kast') == 1
+    assert loaded.error('tafel') == 0
+    loaded.add('bank')
+    assert len(loaded) == 2
+    assert loaded.get('bank') == 3
+    with open('/tmp/test_save.hist', 'wb') as file:
+        file.write(b'OTHG\x01\x00\x06Legacy\x03str\x01\x05tafel\x02')
+    loaded = Histogram.load('/tmp/test_save.hist')
+    assert str(loaded) == 'Legacy'
+    assert loaded.top(1) == [('tafel', 2)]
+    mixed = Histogram('Mixed', chars=False)
+    mixed.update(['tafel', 1])
+    with raises(ValueError, match='Cannot save "Mixed" with mixed types.'):
+        mixed.save('/tmp/test_save.hist')
+    with open('/tmp/test_save.hist', 'w') as file:
+        file.write('count\tvalue\n')
+    with raises(ValueError, match='Unsupported file format of'
+                ' /tmp/test_save.hist.'):
+        Histogram.load('/tmp/test_save.hist')
+
+
+def test_from_tsv_json():
+    chars = Histogram('Chars')
+    chars.update(['één tafel', 'stoel '])
+    words = Histogram('Words', chars=False)
+    words.update(['tafel', 'stoel', 'tafel'])
+    for multi in (True, False):
+        chars.to_tsvfile('/tmp/test_from.tsv', multi=multi)
+        loaded = Histogram.from_tsv('/tmp/test_from.tsv')
+        assert str(loaded) == '/tmp/test_from.tsv'
+        assert sorted(loaded.top(len(chars))) == \
+            sorted(chars.top(len(chars)))
+        chars.to_jsonfile('/tmp/test_from.json', multi=multi)
+        loaded = Histogram.from_json('/tmp/test_from.json')
+        assert str(loaded) == 'Chars'
+        assert sorted(loaded.top(len(chars))) == \
+            sorted(chars.top(len(chars)))
+    chars.add('\t')
+    chars.to_tsvfile('/tmp/test_from.tsv', head=False, unicode=False)
+    loaded = Histogram.from_tsv('/tmp/test_from.tsv', desc='Plain')
+    assert sorted(loaded.top(len(chars))) == sorted(chars.top(len(chars)))
+    words.to_tsvfile('/tmp/test_from.tsv', unicode=False)
+    loaded = Histogram.from_tsv('/tmp/test_from.tsv', chars=False)
+    assert loaded.top(2) == [('tafel', 2), ('stoel', 1)]
+    words.to_jsonfile('/tmp/test_from.json', desc=False, unicode=False)
+    loaded = Histogram.from_json('/tmp/test_from.json', desc='Loaded',
+                                 chars=False)
+    assert str(loaded) == 'Loaded'
+    assert loaded.top(2) == [('tafel', 2), ('stoel', 1)]
+
+
 def test_too_many_values():
     hist = Histogram('Too many values')
     for _ in range(10000000):
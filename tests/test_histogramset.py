@@ -0,0 +1,32 @@
+"""Test class HistogramSet."""
+
+from opentaal import Histogram, HistogramSet
+
+# pylint:disable=missing-function-docstring,unspecified-encoding
+
+
+def test_ingest(monkeypatch):
+    text = 'de tafel\nen de stoel\nde tafel\nvan de tafel'
+    with open('/tmp/test_histogramset.txt', 'w') as file:
+        file.write(text)
+    monkeypatch.setattr(Histogram, 'BLOCK_SIZE', 5)
+    hists = HistogramSet()
+    chars = hists.add(Histogram('Chars'))
+    words = hists.add(Histogram('Lines', chars=False))
+    bigrams = hists.add(Histogram('Bigrams', chars=False, ngram=2))
+    lengths = hists.add(Histogram('Lengths'), derive=len)
+    assert len(hists) == 4
+    assert list(hists) == [chars, words, bigrams, lengths]
+    hists.ingest('/tmp/test_histogramset.txt')
+    filename = '/tmp/test_histogramset.txt'
+    for hist, other in ((chars, Histogram('Chars', filename)),
+                        (words, Histogram('Lines', filename, chars=False))):
+        assert hist.top(len(hist)) == other.top(len(other))
+    assert bigrams.top(1) == [('de tafel', 3)]
+    assert lengths.top(2) == [(8, 2), (11, 1)]
+    assert lengths.get(12) == 1
+    hists.ingest('/tmp/test_histogramset.txt', mapped=True)
+    assert lengths.get(8) == 4
+    assert words.get('de tafel') == 4
+
+# pylint:enable=missing-function-docstring,unspecified-encoding
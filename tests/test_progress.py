@@ -0,0 +1,98 @@
+"""Test class Progress."""
+
+from asyncio import run
+from gzip import open as gzip_open
+from os import makedirs
+from os.path import getsize
+from shutil import rmtree
+
+from pytest import approx
+
+from opentaal import Corpus, Histogram, HistogramSet, Progress
+from tests.clock import Clock
+
+# pylint:disable=missing-function-docstring,unspecified-encoding
+
+
+def test_members(capsys):
+    clock = Clock()
+    progress = Progress(interval=3, clock=clock)
+    assert progress.remaining() is None
+    progress.expect(4 * 1048576)
+    clock.now = 2.0
+    progress.update(size=1048576, lines=10, values=50, bins=5)
+    assert capsys.readouterr().err == ''
+    clock.now = 4.0
+    progress.update(size=1048576, lines=10, values=50)
+    assert progress.size() == 2097152
+    assert progress.total() == 4194304
+    assert progress.lines() == 20
+    assert progress.values() == 100
+    assert progress.bins() == 5
+    assert capsys.readouterr().err == '2.0 of 4.0 MB, 20 lines, 100 values,' \
+        ' 5 bins, 4.0 s, 0.5 MB/s, 4.0 s remaining\n'
+    clock.now = 6.0
+    progress.update(force=True)
+    assert capsys.readouterr().err.endswith(', 6.0 s remaining\n')
+    assert progress.elapsed() == 6
+    assert progress.throughput() == approx(2097152 / 6)
+
+
+def test_ingest(monkeypatch):
+    text = 'tafel\nstoel\néén\ntafel\n' * 100
+    makedirs('/tmp/test_progress', exist_ok=True)
+    with open('/tmp/test_progress/a.txt', 'w', encoding='utf8') as file:
+        file.write(text)
+    with gzip_open('/tmp/test_progress/b.txt.gz', 'wb') as file:
+        file.write(text.encode('utf8'))
+    monkeypatch.setattr(Histogram, 'BLOCK_SIZE', 64)
+    reports = []
+    for filename in ('/tmp/test_progress/a.txt',
+                     '/tmp/test_progress/b.txt.gz'):
+        for mapped in (False, True):
+            for chars in (False, True):
+                progress = Progress(reports.append, interval=0)
+                hist = Histogram('Progress', filename=filename, chars=chars,
+                                 mapped=mapped, progress=progress)
+                assert progress.size() == getsize(filename)
+                assert progress.total() == getsize(filename)
+                assert progress.lines() == 400
+                assert progress.values() == (1800 if chars else 400)
+                assert progress.bins() == len(hist)
+    assert len(reports) > 8
+    progress = Progress(reports.append)
+    Histogram.from_paths('Paths', '/tmp/test_progress', chars=False, jobs=2,
+                         progress=progress)
+    assert progress.values() == 800
+    assert progress.bins() == 3
+    assert progress.size() == progress.total()
+    progress = Progress(reports.append)
+    hists = HistogramSet()
+    chars = hists.add(Histogram('Chars'))
+    lengths = hists.add(Histogram('Lengths'), derive=len)
+    hists.ingest('/tmp/test_progress/a.txt', progress=progress)
+    assert progress.lines() == 400
+    assert progress.values() == 1800 + 400
+    assert progress.bins() == len(chars) + len(lengths) == 9 + 2
+    assert progress.size() == progress.total()
+    rmtree('/tmp/test_progress_cache', ignore_errors=True)
+    progress = Progress(reports.append)
+    hist = Corpus('Corpus', '/tmp/test_progress_cache',
+                  chars=False).update('/tmp/test_progress', progress=progress)
+    assert progress.lines() == 800
+    assert progress.values() == 800
+    assert progress.bins() == len(hist) == 3
+    assert progress.size() == progress.total()
+
+    async def blocks():
+        yield text.encode('utf8')
+    progress = Progress(reports.append)
+    hist = Histogram('Async', chars=False)
+    run(hist.aingest(blocks(), progress=progress))
+    assert progress.size() == len(text.encode('utf8'))
+    assert progress.values() == 400
+    assert progress.bins() == 3
+    run(hist.aingest_many([blocks(), blocks()], progress=progress))
+    assert progress.values() == 1200
+
+# pylint:enable=missing-function-docstring,unspecified-encoding
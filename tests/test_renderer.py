@@ -0,0 +1,24 @@
+"""Test class Renderer."""
+
+from os.path import isfile
+
+from opentaal import Histogram, Renderer
+
+# pylint:disable=missing-function-docstring
+
+
+def test_render():
+    chars = Histogram('Chars')
+    chars.update(['tafel', 'stoel', '#'])
+    words = Histogram('Words', chars=False)
+    words.update(['tafel', 'stoel', 'tafel'])
+    with Renderer() as renderer:
+        renderer.render([(chars, '/tmp/test_render_chars.png'),
+                         (words, '/tmp/test_render_words.png')],
+                        unicode=False, pattern=False)
+        words.to_graphfile('/tmp/test_render_words.svg', term='svg',
+                           unicode=False, renderer=renderer)
+    assert not isfile('/tmp/test_render_chars.png.tsv')
+    chars.to_graphfile('/tmp/test_render_chars.svg', term='svg')
+
+# pylint:enable=missing-function-docstring
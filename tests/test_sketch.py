@@ -0,0 +1,99 @@
+"""Test class Sketch."""
+
+from random import randint, seed
+from collections import Counter
+from numpy import float64, int64
+from pytest import fixture, raises
+
+from opentaal import Sketch
+
+# pylint:disable=missing-function-docstring
+
+
+@fixture
+def words():
+    seed(2.71828)
+    return [f'woord{randint(1, 3) if randint(0, 1) else randint(4, 2000)}'
+            for _ in range(10000)]
+
+# pylint:disable=redefined-outer-name
+
+
+def test_members():
+    sketch = Sketch('Empty', epsilon=0.01, delta=0.05)
+    assert str(sketch) == 'Empty'
+    assert repr(sketch) == 'Empty epsilon=0.01 delta=0.05 width=272 depth=3' \
+        ' total=0'
+    assert sketch.get('tafel') == 0
+    with raises(ValueError, match='Unsupported epsilon 0 or delta 0.5.'):
+        assert Sketch('Zero', epsilon=0, delta=0.5)
+
+
+def test_add(words):
+    exact = Counter(words)
+    for conservative in (True, False):
+        sketch = Sketch('Add', epsilon=0.01, conservative=conservative)
+        for word in words:
+            sketch.add(word)
+        assert sketch.total() == len(words)
+        for word, count in exact.items():
+            assert count <= sketch.get(word)
+        assert sketch.get('woord1') - exact['woord1'] <= 0.01 * len(words)
+    with raises(ValueError, match='Cannot add empty string or None to'
+                ' "Add".'):
+        assert sketch.add('')
+    with raises(ValueError, match='Cannot add count 0 to "Add".'):
+        assert sketch.add('tafel', count=0)
+    numbers = Sketch('Numbers')
+    numbers.add(1)
+    numbers.add(1.0)
+    numbers.update([True, int64(1), float64(2.5), 2.5])
+    assert numbers.get(1) == numbers.get(int64(1)) == 4
+    assert numbers.get(2.5) == 2
+    assert numbers.get(True) == 4
+
+
+def test_update(words):
+    for conservative in (True, False):
+        one = Sketch('One', conservative=conservative)
+        for word in words:
+            one.add(word)
+        many = Sketch('Many', conservative=conservative)
+        many.update(words)
+        assert many.total() == one.total()
+        if not conservative:
+            for word in set(words):
+                assert many.get(word) == one.get(word)
+        for word in set(words):
+            assert many.get(word) >= words.count(word)
+    conservative = Sketch('Conservative', epsilon=0.01)
+    conservative.update(words)
+    plain = Sketch('Plain', epsilon=0.01, conservative=False)
+    plain.update(words)
+    for word in set(words):
+        assert words.count(word) <= conservative.get(word) <= plain.get(word)
+    with raises(ValueError, match='Cannot add count 0 to "Conservative".'):
+        conservative.update({'tafel': 0})
+
+
+def test_merge(words):
+    first = Sketch('First', conservative=False)
+    first.update(words[:5000])
+    second = Sketch('Second', conservative=False)
+    second.update(words[5000:])
+    both = Sketch('Both', conservative=False)
+    both.update(words)
+    merged = first + second
+    assert str(merged) == 'First'
+    assert merged.total() == len(words)
+    for word in set(words):
+        assert merged.get(word) == both.get(word)
+    first += second
+    assert first.get('woord1') == both.get('woord1')
+    with raises(ValueError, match='Cannot merge "Other" into "First" because'
+                ' epsilon or delta differs.'):
+        first.merge(Sketch('Other', epsilon=0.1))
+
+# pylint:enable=redefined-outer-name
+
+# pylint:enable=missing-function-docstring
@@ -0,0 +1,70 @@
+"""Test class Window."""
+
+from pytest import raises
+
+from opentaal import Window
+from tests.clock import Clock
+
+# pylint:disable=missing-function-docstring
+
+
+def test_members():
+    window = Window('Empty', size=8)
+    assert str(window) == 'Empty'
+    assert len(window) == 0
+    assert window.get('a') == 0
+    assert window.top(1) == []
+    with raises(ValueError, match='Unsupported size None, seconds None or'
+                ' slices 8.'):
+        assert Window('Neither')
+    with raises(ValueError, match='Unsupported size 4, seconds None or'
+                ' slices 8.'):
+        assert Window('Too small', size=4)
+
+
+def test_size():
+    window = Window('Size', size=8, slices=4, chars=False)
+    for value in ('tafel', 'stoel', 'tafel', 'kast'):
+        window.add(value)
+    assert window.top(2) == [('tafel', 2), ('stoel', 1)]
+    window.update(['stoel'] * 4)
+    assert window.get('tafel') == 2
+    window.add('kast')
+    assert window.get('tafel') == 1
+    assert window.get('stoel') == 4
+    window.update(['bank'] * 7)
+    assert window.histogram().top(len(window)) == [('bank', 7), ('kast', 1)]
+    assert window.minimum() == 1
+    assert window.maximum() == 7
+    window.update(['bank'] * 100)
+    assert window.maximum() == 8
+    assert len(window) == 1
+
+
+def test_rotation():
+    window = Window('Rotation', size=6, slices=2, chars=False)
+    window.update(['c'] * 3)
+    window.update(['c', 'a', 'a'])
+    window.add('z')
+    assert window.get('a') == 2
+    assert window.maximum() == 2
+    assert window.top(3) == [('a', 2), ('c', 1), ('z', 1)]
+
+
+def test_seconds():
+    clock = Clock()
+    window = Window('Seconds', seconds=10, slices=5, clock=clock)
+    window.add('de')
+    clock.now = 4.5
+    window.update(['tafel', 'de'])
+    assert window.get('d') == 2
+    clock.now = 10.0
+    assert window.get('d') == 1
+    assert window.get('t') == 1
+    clock.now = 14.0
+    assert len(window) == 0
+    window.add('a')
+    clock.now = 100.0
+    assert window.maximum() == 0
+
+# pylint:enable=missing-function-docstring